@@ -4,6 +4,7 @@ import os
 import sys
 import pathlib
 from importlib.metadata import version
+from time import perf_counter
 
 if platform.system() in {"Linux", "Darwin"}:
     # Required for downloads from the LuxCore Online Library
@@ -29,19 +30,30 @@ if bpy.app.version < (4, 2, 0):
     )
 
 
+# Set the environment variable BLC_PROFILE_STARTUP=1 to print the import
+# and registration times of the submodules
+_utils_start = perf_counter()
+from . import utils
+from .utils import startup_profile
+
+startup_profile.add("Import", "utils", perf_counter() - _utils_start)
+
 # Take care of PyLuxCore, as other modules may want to import it
-from . import luxloader
+with startup_profile.measure("Import", "luxloader"):
+    from . import luxloader
 
 if _needs_reload:
     import importlib
 
     luxloader = importlib.reload(luxloader)
 
-luxloader.ensure_pyluxcore()
+with startup_profile.measure("Startup", "ensure_pyluxcore"):
+    luxloader.ensure_pyluxcore()
 
 # Import pyluxcore
 try:
-    import pyluxcore
+    with startup_profile.measure("Import", "pyluxcore"):
+        import pyluxcore
 except ImportError as error:
     msg = f"\n\nCould not import pyluxcore. \n\nImportError: {error}"
     # Raise from None to suppress the unhelpful
@@ -50,7 +62,20 @@ except ImportError as error:
 
 
 # Import other modules
-from . import utils, properties, export, nodes, operators, engine, handlers, ui
+with startup_profile.measure("Import", "properties"):
+    from . import properties
+with startup_profile.measure("Import", "export"):
+    from . import export
+with startup_profile.measure("Import", "nodes"):
+    from . import nodes
+with startup_profile.measure("Import", "operators"):
+    from . import operators
+with startup_profile.measure("Import", "engine"):
+    from . import engine
+with startup_profile.measure("Import", "handlers"):
+    from . import handlers
+with startup_profile.measure("Import", "ui"):
+    from . import ui
 
 if _needs_reload:
     import importlib
@@ -72,11 +97,13 @@ submodules = (properties, nodes, operators, handlers, engine, ui)
 def register():
     utils.register_module("Main", [], submodules)
 
-    pyluxcore.Init(utils.log.LuxCoreLog.add)
+    with startup_profile.measure("Startup", "pyluxcore.Init"):
+        pyluxcore.Init(utils.log.LuxCoreLog.add)
     print(
         f"BlendLuxCore {utils.get_version_string()} registered "
         f"(with pyluxcore {version('pyluxcore')})"
     )
+    startup_profile.report()
 
 
 def unregister():
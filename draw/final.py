@@ -1,6 +1,7 @@
 """Final rendering."""
 
 from time import time, sleep
+import bpy
 import numpy as np
 import pyluxcore as plc
 from .. import utils
@@ -8,7 +9,7 @@ from ..export.aovs import get_denoiser_imgpipeline_props
 from ..properties.denoiser import LuxCoreDenoiser
 from ..properties.display import LuxCoreDisplaySettings
 from ..utils import view_layer as utils_view_layer
-from .utils import ConvertFilmChannelOutput
+from .utils import BufferPool, ConvertFilmChannelOutput
 
 
 # Note: RGB_IMAGEPIPELINE and RGBA_IMAGEPIPELINE are missing here because they
@@ -41,6 +42,44 @@ AOVS_WITH_ID = {
 
 DEFAULT_AOV_SETTINGS = ConvertFilmChannelOutput(3, np.float32, 3)
 
+# AOVs that only depend on the geometry seen by the camera. They are imported
+# once after the first pass, and again when the render stops. All other AOVs
+# are imported every LuxCoreDisplaySettings.aov_interval film refreshes, or on
+# every refresh if they are shown in an image editor.
+STATIC_AOVS = {
+    "DEPTH",
+    "POSITION",
+    "GEOMETRY_NORMAL",
+    "SHADING_NORMAL",
+    "AVG_SHADING_NORMAL",
+    "UV",
+    "MATERIAL_ID",
+    "MATERIAL_ID_COLOR",
+    "OBJECT_ID",
+    "MATERIAL_ID_MASK",
+    "OBJECT_ID_MASK",
+}
+
+
+def _get_displayed_pass_names(render_layer):
+    """
+    Names of the passes shown in image editors that display the render result.
+    Blender only exposes the index of the displayed pass in the image user.
+    """
+    names = set()
+    passes = render_layer.passes
+    for window_manager in bpy.data.window_managers:
+        for window in window_manager.windows:
+            for area in window.screen.areas:
+                if area.type != "IMAGE_EDITOR":
+                    continue
+                space = area.spaces.active
+                if space.image and space.image.type == "RENDER_RESULT":
+                    index = space.image_user.multilayer_pass
+                    if 0 <= index < len(passes):
+                        names.add(passes[index].name)
+    return names
+
 
 class FrameBufferFinal:
     """FrameBuffer for final render."""
@@ -60,6 +99,13 @@ class FrameBufferFinal:
             self._combined_output_type = plc.FilmOutputType.RGB_IMAGEPIPELINE
             self._convert_combined = ConvertFilmChannelOutput(3, np.float32, 4)
 
+        # Conversion buffers, reused on every refresh
+        self._buffer_pool = BufferPool()
+
+        # AOV refresh policy, see STATIC_AOVS
+        self._refresh_count = 0
+        self._static_aovs_done = set()
+
         # How long the last run of the denoiser took, in seconds
         self.denoiser_last_elapsed_time = 0
         self.denoiser_last_samples = 0
@@ -80,28 +126,30 @@ class FrameBufferFinal:
         render_layer = result.layers[0]
 
         combined = render_layer.passes["Combined"]
-        film = session.GetFilm()
-        if self._combined_output_type == plc.FilmOutputType.RGB_IMAGEPIPELINE:
-            size = self._width * self._height
-            pixels = np.empty([size, 3], dtype=np.float32)
-            film.GetOutputFloat(self._combined_output_type, pixels)
-            pixels = np.c_[pixels, np.ones(size, dtype=np.float32)]
-            combined.rect.foreach_set(pixels.ravel())
-        elif (
-            self._combined_output_type == plc.FilmOutputType.RGBA_IMAGEPIPELINE
-        ):
-            size = self._width * self._height
-            pixels = np.empty([size, 4], dtype=np.float32)
-            film.GetOutputFloat(self._combined_output_type, pixels)
-            combined.rect.foreach_set(pixels.ravel())
-        else:
-            raise ValueError(
-                f"Unhandled Output Type {self._combined_output_type}"
-            )
+        self._convert_combined(
+            session.GetFilm(),
+            self._combined_output_type,
+            0,
+            self._width,
+            self._height,
+            combined,
+            True,
+            pool=self._buffer_pool,
+        )
 
         # Import AOVs, import light groups and trigger denoiser,
         # but only in final render, not in material preview mode
         if not engine.is_preview:
+            display = scene.luxcore.display
+            refresh_aovs = (
+                render_stopped
+                or LuxCoreDisplaySettings.refresh
+                or self._refresh_count % display.aov_interval == 0
+            )
+            self._refresh_count += 1
+            samples = session.GetStats().Get("stats.renderengine.pass").GetInt()
+            displayed_passes = set() if refresh_aovs else _get_displayed_pass_names(render_layer)
+
             # AOVs
             scene_layer_aovs = scene.view_layers[active_layer].luxcore.aovs
             enabled_aov_outputs = (
@@ -118,6 +166,10 @@ class FrameBufferFinal:
                         render_layer,
                         session,
                         engine,
+                        refresh=refresh_aovs,
+                        render_stopped=render_stopped,
+                        samples=samples,
+                        displayed_passes=displayed_passes,
                     )
                 except RuntimeError as error:
                     print(f"Error on import of AOV {output_name}: {error}")
@@ -144,6 +196,8 @@ class FrameBufferFinal:
                         True,
                         i,
                         name,
+                        refresh=refresh_aovs,
+                        displayed_passes=displayed_passes,
                     )
                 except RuntimeError as error:
                     print(
@@ -169,8 +223,17 @@ class FrameBufferFinal:
         execute_imagepipeline=True,
         index=0,
         lightgroup_name="",
+        refresh=True,
+        render_stopped=False,
+        samples=0,
+        displayed_passes=(),
     ):
-        """Import AOV into render layer."""
+        """Import AOV into render layer.
+
+        If refresh is False (or the AOV is static and was already imported),
+        the pass is not written, it keeps the content of the last refresh in
+        the render result. Passes in displayed_passes are always refreshed.
+        """
         # print(output_name)  # Debug
 
         convert_func = AOVS.get(output_name, DEFAULT_AOV_SETTINGS)
@@ -197,6 +260,18 @@ class FrameBufferFinal:
         else:
             pass_name = output_name
 
+        # Outputs with ID have the index appended, e.g. OBJECT_ID_MASK2
+        if output_name.rstrip("0123456789") in STATIC_AOVS:
+            refresh = render_stopped or output_name not in self._static_aovs_done
+            if samples > 0:
+                # The first pass is done, the AOV will not change much anymore
+                self._static_aovs_done.add(output_name)
+        elif pass_name in displayed_passes:
+            refresh = True
+
+        if not refresh:
+            return
+
         blender_pass = render_layer.passes[pass_name]
 
         # Convert and copy the buffer into the blender_pass.rect
@@ -208,6 +283,7 @@ class FrameBufferFinal:
             self._height,
             blender_pass,
             execute_imagepipeline,
+            pool=self._buffer_pool,
         )
 
     def _refresh_denoiser(
@@ -19,6 +19,32 @@ import bpy
 import pyluxcore
 
 
+class BufferPool:
+    """Preallocated buffers, reused across film refreshes.
+
+    Each framebuffer owns one pool. The buffers are only used during one
+    conversion (foreach_set() copies the data), so all AOVs of the same size
+    share them and the memory use of a refresh does not depend on the number
+    of AOVs.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+
+    def get(self, role: str, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        """Get a buffer, allocated on first use."""
+        key = (role, shape, np.dtype(dtype))
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[key] = buf
+        return buf
+
+    def clear(self):
+        """Release all buffers."""
+        self._buffers.clear()
+
+
 class ConvertFilmChannelOutput:
     """Inject a LuxCore film output into a Blender rendering buffer."""
 
@@ -46,6 +72,13 @@ class ConvertFilmChannelOutput:
             raise ValueError(
                 f"AOV: Bad value for source dtype: '{self.src_dtype}'"
             )
+        if not (
+            (self.src_depth, self.dst_depth) in [(1, 4), (2, 3), (3, 4)]
+            or self.src_depth == self.dst_depth
+        ):
+            raise ValueError(
+                f"AOV - Inconsistent depths: {self.src_depth} / {self.dst_depth}"
+            )
 
     @staticmethod
     def check_size(render_engine, width, height):
@@ -68,67 +101,67 @@ class ConvertFilmChannelOutput:
         height: int,
         render_pass: bpy.types.RenderPass,
         execute_image_pipeline: bool,
+        pool: BufferPool = None,
     ):
-        # Destination depth - in most cases, it is 4; but for UV, it will be 3
-        dst_depth = self.dst_depth
+        if pool is None:
+            pool = BufferPool()
+
+        size = width * height
+        # Destination buffer, in the layout expected by Blender
+        # (in most cases, depth is 4; but for UV, it will be 3)
+        out = pool.get("dst", (size, self.dst_depth), np.float32)
+
+        # Get LuxCore data in a float buffer. If no padding is needed, the
+        # film output is written directly into the destination buffer
+        if self.src_depth == self.dst_depth:
+            src = out
+        else:
+            src = pool.get("src", (size, self.src_depth), np.float32)
 
-        # Get LuxCore data in a float buffer
-        buf = np.empty([width, height, self.src_depth], dtype=self.src_dtype)
         if self.src_dtype == np.float32:
             film.GetOutputFloat(
-                output_type, buf, output_index, execute_image_pipeline
+                output_type, src, output_index, execute_image_pipeline
             )
         elif self.src_dtype == np.uint32:
+            buf = pool.get("uint", (size, self.src_depth), np.uint32)
             film.GetOutputUInt(
                 output_type, buf, output_index, execute_image_pipeline
             )
             # Convert buffer to float
-            buf = buf.astype(np.float32)
-
+            if self.is_id:
+                np.multiply(buf, 1 / 2**32, out=src, casting="unsafe")
+            else:
+                np.copyto(src, buf, casting="unsafe")
         else:
             raise ValueError(
                 "ConvertFilmChannelOutput: "
                 f"Unhandled source type ('{self.src_dtype}'"
             )
 
-        # Reshape source buffer
-        if self.src_depth == 1 and self.dst_depth == 4 and self.src_dtype == np.float32:
-            # Repeat on RGB and pad with 1.f in alpha channel
-            buf = np.concat(
-                (buf.repeat(3, axis=-1), np.ones(shape=buf.shape)), axis=2
-            )
-        elif self.src_depth == 1 and self.dst_depth == 1 and self.src_dtype == np.uint32:
-            if self.is_id:
-                buf /= 2**32
+        # Normalize if required.
+        if self.normalize:
+            # We only normalize channels 0 to 2, as channel 3 is intended for alpha
+            hi_channel = min(self.src_depth, 2)
+            src_view = src[:, 0:hi_channel]  # Basic slicing, this is a view
+            if max_value := np.max(src_view):
+                src_view /= max_value
 
+        # Pad the source buffer into the destination buffer
+        if self.src_depth == 1 and self.dst_depth == 4:
+            # Repeat on RGB and pad with 1.f in alpha channel
+            out[:, 0:3] = src
+            out[:, 3] = 1
         elif self.src_depth == 2 and self.dst_depth == 3:
             # This is for UV channel
             # We need to pad the UV pass to 3 elements (Blender can't handle 2
             # elements). The third channel is a mask that is 1 where a UV map
             # exists and 0 otherwise.
-            pad = ((buf[..., 0] != 0) & (buf[..., 1] != 0)).astype(np.float32)
-            pad = pad.reshape(width, height, 1)
-            buf = np.concat((buf, pad), axis=2)
-            dst_depth = 3
+            out[:, 0:2] = src
+            np.logical_and(src[:, 0] != 0, src[:, 1] != 0, out=out[:, 2], casting="unsafe")
         elif self.src_depth == 3 and self.dst_depth == 4:
             # Pad with 1.f in alpha channel
-            buf = np.concat((buf, np.ones(shape=buf.shape)), axis=2)
-        elif self.src_depth == self.dst_depth and self.src_dtype == np.float32:
-            pass
-        else:
-            raise ValueError(
-                f"AOV - Inconsistent depths: {self.src_depth} / {self.dst_depth}"
-            )
-
-        # Normalize if required.
-        if self.normalize:
-            # We only normalize channels 0 to 2, as channel 3 is intended for alpha
-            hi_channel = min(self.src_depth, 2)
-            buf_view = buf[..., 0:hi_channel]  # Basic slicing, this is a view
-            assert buf_view.base is not None
-            if max_value := np.max(buf_view):
-                buf_view /= max_value
+            out[:, 0:3] = src
+            out[:, 3] = 1
 
         # Inject into Blender buffer
-        outbuf = np.reshape(buf, (-1, dst_depth)).astype(np.float32)
-        render_pass.rect.foreach_set(outbuf.ravel())
+        render_pass.rect.foreach_set(out.ravel())
@@ -54,9 +54,19 @@ class FrameBuffer:
             else pyluxcore.FilmOutputType.RGB_IMAGEPIPELINE
         )
 
-        self.buffer = gpu.types.Buffer(
-            "FLOAT", [self._width * self._height * bufferdepth]
-        )
+        size = self._width * self._height * bufferdepth
+        self.buffer = gpu.types.Buffer("FLOAT", [size])
+        # Staging array for the film output. If the gpu buffer supports the
+        # buffer protocol, the film is written directly into it
+        try:
+            self._data = np.frombuffer(self.buffer, dtype=np.float32)
+            self._data_is_buffer = self._data.flags.writeable and self._data.size == size
+        except (TypeError, ValueError):
+            self._data_is_buffer = False
+        if not self._data_is_buffer:
+            self._data = np.empty(size, dtype=np.float32)
+        # Created on the first draw() after an update(), reused until the next update()
+        self._texture = None
         self._init_opengl()
 
         # Denoiser
@@ -97,6 +107,7 @@ class FrameBuffer:
         )
 
     def __del__(self):
+        self._texture = None
         del self.buffer
 
     def needs_replacement(self, context, scene):
@@ -207,30 +218,34 @@ class FrameBuffer:
     def update(self, luxcore_session, execute_imagepipeline=True):
         # The gpu buffer uses 16-bit float. Values >= 65520 get cast to
         # infinty, leading to a black viewport.
-        # Here, I need to get the data into a separate numpy array to handle
-        # the clamping.
-        bufferdepth = 4 if self._transparent else 3
-        size = self._width * self._height * bufferdepth
-        data = np.empty(size, dtype=np.float32)
+        # Here, I need to get the data into a numpy array to handle the
+        # clamping (done in place, the array is reused on every update).
+        data = self._data
         luxcore_session.GetFilm().GetOutputFloat(
             self._output_type,
             data,
             0,  # index
             execute_imagepipeline
         )
-        data[data > 65519] = 65519
-        self.buffer = gpu.types.Buffer(
-            "FLOAT", [self._width * self._height * bufferdepth], data
-        )
+        np.minimum(data, 65519, out=data)
+        if not self._data_is_buffer:
+            if len(self.buffer) == data.size:
+                # Copy into the existing gpu buffer instead of allocating a new one
+                self.buffer[:] = data
+            else:
+                self.buffer = gpu.types.Buffer("FLOAT", [data.size], data)
+        # Upload the new data on the next draw
+        self._texture = None
 
     def draw(self):
-        format = "RGBA16F" if self._transparent else "RGB16F"
-        image = gpu.types.GPUTexture(
-            size=(self._width, self._height),
-            layers=0,
-            is_cubemap=False,
-            format=format,
-            data=self.buffer,
-        )
-        self.shader.uniform_sampler("image", image)
+        if self._texture is None:
+            format = "RGBA16F" if self._transparent else "RGB16F"
+            self._texture = gpu.types.GPUTexture(
+                size=(self._width, self._height),
+                layers=0,
+                is_cubemap=False,
+                format=format,
+                data=self.buffer,
+            )
+        self.shader.uniform_sampler("image", self._texture)
         self.batch.draw(self.shader)
@@ -123,6 +123,7 @@ class LuxCoreRenderEngine(bpy.types.RenderEngine):
             # Clean up
             del self.session
             self.session = None
+            final.clear_reused_scenes()
         finally:
             utils_view_layer.State.reset()
             LuxCoreRenderEngine.final_running = False
@@ -21,6 +21,25 @@ if _needs_reload:
     importlib.reload(properties)
 
 
+# Exporters and paused sessions kept between the frames of an animation render,
+# if the scene is reused (see LuxCoreConfigExport.reuse_scene).
+# {view layer name: (exporter, session, frame, number of frames rendered with the same scene)}
+_reused_scenes = {}
+
+
+def clear_reused_scenes():
+    """Called when the render job ends, see handlers/render_complete.py"""
+    for _, session, _, _ in _reused_scenes.values():
+        _stop_session(session)
+    _reused_scenes.clear()
+
+
+def _stop_session(session):
+    if session.IsInPause():
+        session.Resume()
+    session.Stop()
+
+
 def render(engine, depsgraph):
     print("=" * 50)
     scene = depsgraph.scene_eval
@@ -56,6 +75,8 @@ def render(engine, depsgraph):
 
     _add_passes(engine, layer, scene)
     _render_layer(engine, depsgraph, statistics, layer)
+    # Warnings added during export or rendering
+    LuxCoreErrorLog.refresh_ui()
 
     if _stop_requested(engine):
         # Blender skips the rest of the render layers anyway
@@ -66,9 +87,12 @@ def render(engine, depsgraph):
 
 def _render_layer(engine, depsgraph, statistics, view_layer):
     engine.reset()
-    engine.exporter = export.Exporter(statistics)
-    engine.session = engine.exporter.create_session(depsgraph, engine=engine, view_layer=view_layer)
     scene = depsgraph.scene_eval
+    reused_frames = _reuse_scene(engine, depsgraph, statistics, view_layer)
+
+    if reused_frames == 0:
+        engine.exporter = export.Exporter(statistics)
+        engine.session = engine.exporter.create_session(depsgraph, engine=engine, view_layer=view_layer)
 
     if engine.session is None:
         # session is None, but no error was thrown
@@ -79,7 +103,9 @@ def _render_layer(engine, depsgraph, statistics, view_layer):
 
     # Create session
     start = time()
-    engine.session.Start()
+    if reused_frames == 0:
+        # A reused session is already running again, see Exporter.update_frame()
+        engine.session.Start()
     session_init_time = time() - start
     print("Session started in %.1f s" % session_init_time)
     statistics.session_init_time.value = session_init_time
@@ -191,15 +217,63 @@ def _render_layer(engine, depsgraph, statistics, view_layer):
     stats = utils_render.update_stats(engine.session)
     utils_render.update_status_msg(stats, engine, depsgraph.scene, config, time_until_film_refresh=0)
     engine.framebuffer.draw(engine, engine.session, depsgraph.scene, render_stopped=True)
-    engine.update_stats("Render", "Stopping session...")
-    if engine.session.IsInPause():
-        engine.session.Resume()
-    engine.session.Stop()
+    is_last_frame = scene.frame_current + scene.frame_step > scene.frame_end
+    if engine.exporter.keep_scene and not _stop_requested(engine) and not is_last_frame:
+        # Keep the session paused, the next frame is applied with a scene edit
+        if not engine.session.IsInPause():
+            engine.session.Pause()
+        _reused_scenes[view_layer.name] = (
+            engine.exporter, engine.session, scene.frame_current, reused_frames + 1
+        )
+    else:
+        engine.update_stats("Render", "Stopping session...")
+        _stop_session(engine.session)
     # Clean up
     del engine.session
     engine.session = None
 
 
+def _reuse_scene(engine, depsgraph, statistics, view_layer):
+    """
+    Try to update the scene of the previous animation frame instead of
+    exporting everything again. Returns the number of frames the scene was
+    used for so far, 0 if a full export is needed.
+    """
+    scene = depsgraph.scene_eval
+    export_settings = scene.luxcore.config.export
+    if not (engine.is_animation and export_settings.reuse_scene):
+        clear_reused_scenes()
+        return 0
+
+    try:
+        exporter, session, frame, reused_frames = _reused_scenes.pop(view_layer.name)
+    except KeyError:
+        return 0
+
+    if scene.frame_current != frame + scene.frame_step:
+        # Not the next frame of the same animation render
+        _stop_session(session)
+        return 0
+    if reused_frames >= export_settings.rebuild_interval:
+        print("[Engine/Final] Rebuild interval reached, exporting the whole scene")
+        _stop_session(session)
+        return 0
+
+    exporter.stats = statistics
+    try:
+        success = exporter.update_frame(depsgraph, engine, view_layer, session)
+    except Exception:
+        _stop_session(session)
+        raise
+    if not success:
+        _stop_session(session)
+        return 0
+
+    engine.exporter = exporter
+    engine.session = session
+    return reused_frames
+
+
 def _stop_requested(engine):
     return engine.test_break() or LuxCoreDisplaySettings.stop_requested
 
@@ -66,6 +66,11 @@ def force_session_restart(engine):
 def view_update(engine, context, depsgraph, changes=None):
     start = time()
 
+    if engine.exporter:
+        # Any setting might have changed, if the changes are not handled below,
+        # the next view_draw() has to check the config and camera again
+        engine.exporter.view_fingerprint.invalidate()
+
     if engine.starting_session or engine.viewport_fatal_error:
         # Prevent deadlock
         return
@@ -223,7 +228,15 @@ def view_draw(engine, context, depsgraph):
 
     # Check for changes because some actions in Blender (e.g. moving the viewport
     # camera) do not trigger a view_update() call, but only a view_draw() call.
-    changes = engine.exporter.get_viewport_changes(depsgraph, context)
+    changes = engine.exporter.get_viewport_changes(depsgraph, context, is_redraw=True)
+
+    view_fingerprint = engine.exporter.view_fingerprint
+    if scene.luxcore.debug.enabled and view_fingerprint.redraw_count % 500 == 0:
+        print(
+            f"[Engine/Viewport] Change detection: {view_fingerprint.conversion_count} conversions "
+            f"in {view_fingerprint.redraw_count} redraws, "
+            f"{view_fingerprint.get_average_overhead() * 1000:.3f} ms per redraw"
+        )
 
     if changes & export.Change.REQUIRES_VIEW_UPDATE:
         engine.tag_redraw()
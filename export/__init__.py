@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from time import time
 
 _needs_reload = "bpy" in locals()
@@ -7,6 +8,7 @@ import pyluxcore
 from .. import utils
 from ..utils import render as utils_render
 from ..utils import compatibility as utils_compatibility
+from ..utils import memory as utils_memory
 from ..utils.errorlog import LuxCoreErrorLog
 from . import (
     caches,
@@ -21,6 +23,7 @@ from . import (
     world,
     mesh_converter,
 )
+from .image import ImageExporter
 from .light import WORLD_BACKGROUND_LIGHT_NAME
 from .caches.object_cache import supports_live_transform
 
@@ -39,11 +42,16 @@ if _needs_reload:
         halt,
         world,
         utils,
+        utils_memory,
         mesh_converter,
     )
     for module in modules:
         importlib.reload(module)
 
+# Minimum number of converted objects between two parses of the scene props
+# when the memory budget is exceeded (each parse has some overhead)
+MIN_OBJECTS_PER_BATCH = 100
+
 
 class Change:
     NONE = 0
@@ -84,16 +92,39 @@ class Exporter(object):
         self.scene = None  # TODO I would like to remove this, the evaluated scene is temporary
         self.stats = stats
 
-        self.config_cache = caches.StringCache()
+        self.config_cache = caches.DigestCache()
         self.camera_cache = caches.CameraCache()
+        self.view_fingerprint = caches.ViewFingerprintCache()
         # self.object_cache = caches.ObjectCache()
         self.object_cache2 = caches.ObjectCache2()
         self.material_cache = caches.MaterialCache()
         self.visibility_cache = caches.VisibilityCache()
         self.world_cache = caches.WorldCache()
-        self.imagepipeline_cache = caches.StringCache()
-        self.halt_cache = caches.StringCache()
+        self.imagepipeline_cache = caches.DigestCache()
+        self.halt_cache = caches.DigestCache()
+        # SessionPropsUpdates.count when the imagepipeline and halt conditions
+        # were last converted in final render
+        self.session_props_update_count = 0
+        # Persistent mesh cache, only created in final render if enabled
+        self.mesh_cache = None
+        # Worker threads for the mesh conversion, only exist during the first
+        # export of a final render
+        self.mesh_pool = None
+        # Memory used by the export phases, reported in the statistics
+        self.memory_phases = utils_memory.MemoryPhases()
+        # Scene props batching in first_run(), see check_props_batch()
+        # Soft memory limit in bytes, 0 means disabled
+        self.memory_budget = 0
+        # Objects per batch, 0 means disabled
+        self.props_batch_size = 0
+        self.objects_in_batch = 0
+        self.props_batch_count = 0
+        self.props_parse_time = 0
         self.motion_blur_enabled = False
+        # Animation render with LuxCoreConfigExport.reuse_scene: the session
+        # is kept (see engine/final.py) and the instances for update_frame()
+        self.keep_scene = False
+        self.instances = None
 
         # A dictionary with the following mapping:
         # {node_key: luxcore_name}
@@ -103,6 +134,10 @@ class Exporter(object):
         # TODO: currently the node cache has to be cleared when an output node starts
         # to export, because we don't have one global properties object.
         self.node_cache = {}
+        # Materials that were already converted during this export
+        self.material_export_cache = caches.MaterialExportCache()
+        # Derived flags of node trees (e.g. if pointiness is used), see NodeTreeFlags
+        self.node_tree_flags = caches.NodeTreeFlagsCache()
 
         # If a light/material uses a lightgroup, the id is stored here during export
         self.lightgroup_cache = set()
@@ -122,11 +157,39 @@ class Exporter(object):
         stats = self.stats
         if stats:
             stats.reset()
+        self.session_props_update_count = caches.SessionPropsUpdates.count
 
         # We have to run the compatibility code before export because it could
         # be that the user has linked/appended assets with node trees from
         # previous versions of the addon since opening the .blend file.
-        utils_compatibility.run()
+        # Node trees that were already converted are skipped.
+        compatibility_start = time()
+        checked_count = utils_compatibility.run()
+        compatibility_time = time() - compatibility_start
+        print(
+            f"[Exporter] Compatibility check of {checked_count} node trees "
+            f"took {compatibility_time:.3f} s"
+        )
+        if stats:
+            stats.compatibility_time.value = compatibility_time
+
+        # Write the packed images in parallel, the image textures
+        # converted below only have to look them up in the image cache.
+        # Not done in viewport render, where it would read all packed images
+        # on every session start, only the images that are used are written.
+        if context is None:
+            images_start = time()
+            packed_count, written_count = ImageExporter.cache_packed_images(
+                self._get_used_images(depsgraph)
+            )
+            images_time = time() - images_start
+            print(
+                f"[Image Cache] {packed_count - written_count} hits, "
+                f"{written_count} packed images written in {images_time:.3f} s"
+            )
+            if stats:
+                stats.export_time_images.value = images_time
+                stats.image_cache_hits.value = packed_count - written_count
 
         # Scene
         image_resize_policy_props = (
@@ -156,19 +219,88 @@ class Exporter(object):
 
         # Objects and lights
         is_viewport_render = context is not None
-        instances = self.object_cache2.first_run(
-            self,
-            depsgraph,
-            view_layer,
-            engine,
-            luxcore_scene,
-            scene_props,
-            context,
+
+        # Meshes are edited too often in the viewport, the cache would only
+        # fill up the disk there
+        if not is_viewport_render and scene.luxcore.config.export.use_mesh_cache:
+            preferences = utils.get_addon_preferences(bpy.context)
+            self.mesh_cache = caches.MeshDiskCache(
+                preferences.get_cache_dir("meshes"),
+                preferences.mesh_cache_max_size * 1024**3,
+            )
+
+        self.memory_phases.clear()
+        self.objects_in_batch = 0
+        self.props_batch_count = 0
+        self.props_parse_time = 0
+        # Motion blur props are added to the objects after first_run(), LuxCore
+        # can't parse them if the rest of the object was already parsed.
+        # The debug output should contain all scene props.
+        if (
+            not is_viewport_render
+            and not self.motion_blur_enabled
+            and not (scene.luxcore.debug.enabled and scene.luxcore.debug.print_properties)
+        ):
+            export_settings = scene.luxcore.config.export
+            self.memory_budget = int(export_settings.memory_budget * 1024**3)
+            self.props_batch_size = export_settings.props_batch_size
+        else:
+            self.memory_budget = 0
+            self.props_batch_size = 0
+
+        self.keep_scene = (
+            engine is not None
+            and not is_viewport_render
+            and engine.is_animation
+            and scene.luxcore.config.export.reuse_scene
+            and not scene.luxcore.config.use_filesaver
+            and not self.motion_blur_enabled
         )
+
+        mesh_threads = mesh_converter.get_thread_count(scene.luxcore.config.export)
+        if not is_viewport_render and mesh_threads > 1:
+            self.mesh_pool = mesh_converter.MeshWorkerPool(mesh_threads)
+
+        instances = None
+        try:
+            instances = self.object_cache2.first_run(
+                self,
+                depsgraph,
+                view_layer,
+                engine,
+                luxcore_scene,
+                scene_props,
+                context,
+            )
+            if self.mesh_pool and instances is not None:
+                # All meshes have to be defined before the scene is parsed
+                wait_start = time()
+                with self.memory_phases.measure("meshes"):
+                    self.mesh_pool.wait()
+                if stats:
+                    stats.export_time_meshes.value += time() - wait_start
+        finally:
+            if self.mesh_pool:
+                self.mesh_pool.shutdown(cancel=instances is None)
+                self.mesh_pool = None
+
         if instances is None:
             # Export was cancelled by user
             return None
 
+        if stats:
+            stats.material_cache_hits.value = self.material_export_cache.hits
+            stats.material_cache_misses.value = self.material_export_cache.misses
+
+        if self.mesh_cache:
+            if stats:
+                stats.mesh_cache_hits.value = self.mesh_cache.hits
+            print(
+                f"[Mesh Cache] {self.mesh_cache.hits} hits, "
+                f"{self.mesh_cache.misses} misses"
+            )
+            self.mesh_cache.evict()
+
         if is_viewport_render:
             self.visibility_cache.init(depsgraph, context)
 
@@ -182,7 +314,8 @@ class Exporter(object):
                     engine,
                     scene,
                     depsgraph,
-                    self.object_cache2.exported_objects,
+                    self.object_cache2,
+                    instances,
                 )
 
                 if cam_moving:
@@ -210,10 +343,14 @@ class Exporter(object):
             )
             print(scene_props)
             print("-" * 50)
-        luxcore_scene.Parse(scene_props)
+        self._parse_props_batch(luxcore_scene, scene_props)
         # We can only duplicate the instances *after* the scene_props were
         # parsed so the base objects are available for luxcore_scene
-        self.object_cache2.duplicate_instances(instances, luxcore_scene, stats)
+        with self.memory_phases.measure("instancing"):
+            self.object_cache2.duplicate_instances(instances, luxcore_scene, stats)
+        if self.keep_scene:
+            # Needed to check if the instances moved in the next frame
+            self.instances = instances
         # The instances dict can be quite large, delete explicitely (TODO maybe
         # even call gc.collect()?)
         del instances
@@ -235,17 +372,15 @@ class Exporter(object):
         self.config_cache.diff(str(config_props))
 
         # Imagepipeline
-        imagepipeline_props = imagepipeline.convert(scene, context)
-        self.imagepipeline_cache.diff(
-            imagepipeline_props
+        self.imagepipeline_cache.diff_definitions(
+            *imagepipeline.convert_definitions(scene, context)
         )  # Init imagepipeline cache
         # Add imagepipeline to config props
-        config_props.Set(imagepipeline_props)
+        config_props.Set(self.imagepipeline_cache.props)
 
         # Halt conditions
-        halt_props = halt.convert(scene)
-        self.halt_cache.diff(halt_props)
-        config_props.Set(halt_props)
+        self.halt_cache.diff_definitions(*halt.convert_definitions(scene))
+        config_props.Set(self.halt_cache.props)
 
         light_count = luxcore_scene.GetLightCount()
         if light_count > 1000:
@@ -268,6 +403,9 @@ class Exporter(object):
             print(config_props)
             print("-" * 50)
         renderconfig = pyluxcore.RenderConfig(config_props, luxcore_scene)
+        if not is_viewport_render:
+            # LuxCore has loaded all image files now
+            ImageExporter.evict()
 
         # Regularly check if we should abort the export (important in heavy
         # scenes)
@@ -279,6 +417,7 @@ class Exporter(object):
         if stats:
             stats.export_time.value = export_time
             self._init_stats(stats, config_props, scene)
+            self._set_memory_stats(stats)
 
         # Pre-compile CUDA or OpenCL kernels for viewport and final.
         renderengine_type = config_props.Get("renderengine.type").GetString()
@@ -363,9 +502,118 @@ class Exporter(object):
 
         # Do not hold reference to temporary data
         self.scene = None
+        LuxCoreErrorLog.refresh_ui()
         return pyluxcore.RenderSession(renderconfig)
 
-    def get_viewport_changes(self, depsgraph, context=None):
+    def update_frame(self, depsgraph, engine, view_layer, session):
+        """
+        Animation render with a reused scene (see LuxCoreConfigExport.reuse_scene):
+        apply the changes of the new frame to the paused session of the previous
+        frame with a scene edit, like update() does in viewport render.
+        The renderconfig and the session are not replaced, so this is not
+        affected by the leak of issue #577.
+        Returns False if a full export is required instead.
+        """
+        assert self.keep_scene
+
+        print("[Exporter] Updating scene of previous frame")
+        start = time()
+        self.scene = depsgraph.scene_eval
+        scene = self.scene
+        stats = self.stats
+        if stats:
+            stats.reset()
+
+        # Also registers the AOV imagepipelines in the engine
+        config_props = config.convert(self, scene, None, engine)
+        if self.config_cache.diff(str(config_props)):
+            print("[Exporter] Config changed, full export required")
+            self.scene = None
+            return False
+
+        luxcore_scene = session.GetRenderConfig().GetScene()
+        session.BeginSceneEdit()
+
+        try:
+            success = self._update_frame_scene(depsgraph, view_layer, luxcore_scene)
+        finally:
+            # Restarts the rendering with a cleared film
+            session.EndSceneEdit()
+
+        if not success:
+            print("[Exporter] New instanced objects, full export required")
+            self.scene = None
+            return False
+
+        session.Parse(imagepipeline.convert(scene, None))
+        session.Parse(halt.convert(scene))
+        if session.IsInPause():
+            session.Resume()
+
+        export_time = time() - start
+        print("Scene update took %.1f s" % export_time)
+        if stats:
+            stats.export_time.value = export_time
+            stats.light_count.value = luxcore_scene.GetLightCount()
+            self._init_stats(stats, config_props, scene)
+
+        # Do not hold reference to temporary data
+        self.scene = None
+        LuxCoreErrorLog.refresh_ui()
+        return True
+
+    def _update_frame_scene(self, depsgraph, view_layer, luxcore_scene):
+        scene = self.scene
+        # Parse the camera first, it is needed for hair tesselation
+        self.camera_cache.diff(self, scene, depsgraph, None)
+        luxcore_scene.Parse(self.camera_cache.props)
+
+        scene_props = pyluxcore.Properties()
+        self.node_cache.clear()
+        # Image sources, node groups etc. might have changed since the previous frame
+        self.node_tree_flags.clear()
+        # Note: the material export cache is kept, the materials are still in the scene
+
+        changed_instances = self.object_cache2.update_frame(
+            self, depsgraph, view_layer, luxcore_scene, scene_props, self.instances
+        )
+        if changed_instances is None:
+            return False
+
+        # Animated materials (e.g. keyframed node values in the material or in
+        # a pointer node/node group, image sequences)
+        for mat in bpy.data.materials:
+            if mat.as_pointer() not in self.material_export_cache.names:
+                continue
+            if mat.luxcore.use_cycles_nodes or not mat.luxcore.node_tree:
+                node_tree = mat.node_tree
+            else:
+                node_tree = mat.luxcore.node_tree
+            if mat.animation_data or (node_tree and self.node_tree_flags.get(node_tree).frame_dependent):
+                lux_mat_name, mat_props = material.convert(self, depsgraph, mat, False)
+                scene_props.Set(mat_props)
+
+        world_props = world.convert(self, depsgraph, scene, False)
+        scene_props.Set(world_props)
+        luxcore_scene.Parse(scene_props)
+        # The base objects have to be parsed before they can be duplicated
+        self.object_cache2.duplicate_instances(changed_instances, luxcore_scene, None)
+        return True
+
+    def get_viewport_changes(self, depsgraph, context=None, is_redraw=False):
+        """
+        If is_redraw is True (called from view_draw()), the config and camera are
+        only converted if the view fingerprint changed, see ViewFingerprintCache.
+        """
+        start = time()
+        view_changed = self.view_fingerprint.diff(context)
+        if is_redraw:
+            self.view_fingerprint.redraw_count += 1
+            if not view_changed:
+                self.view_fingerprint.check_time += time() - start
+                return Change.NONE
+            self.view_fingerprint.conversion_count += 1
+
         self.scene = depsgraph.scene_eval
         changes = Change.NONE
 
@@ -376,6 +624,9 @@ class Exporter(object):
         if self.camera_cache.diff(self, self.scene, depsgraph, context):
             changes |= Change.CAMERA
 
+        if is_redraw:
+            self.view_fingerprint.check_time += time() - start
+
         # Do not hold reference to temporary data
         self.scene = None
         return changes
@@ -409,16 +660,25 @@ class Exporter(object):
         if changes is None:
             changes = Change.NONE
 
-        # Relevant during final render
-        imagepipeline_props = imagepipeline.convert(depsgraph.scene, context)
-        if self.imagepipeline_cache.diff(imagepipeline_props):
-            changes |= Change.IMAGEPIPELINE
-
         if final:
-            # Halt conditions are only used during final render
-            halt_props = halt.convert(depsgraph.scene)
-            if self.halt_cache.diff(halt_props):
-                changes |= Change.HALT
+            # Only convert the props again if the user edited something since the last check
+            update_count = caches.SessionPropsUpdates.count
+            check_session_props = update_count != self.session_props_update_count
+            self.session_props_update_count = update_count
+        else:
+            check_session_props = True
+
+        if check_session_props:
+            # Relevant during final render
+            if self.imagepipeline_cache.diff_definitions(
+                *imagepipeline.convert_definitions(depsgraph.scene, context)
+            ):
+                changes |= Change.IMAGEPIPELINE
+
+            if final:
+                # Halt conditions are only used during final render
+                if self.halt_cache.diff_definitions(*halt.convert_definitions(depsgraph.scene)):
+                    changes |= Change.HALT
 
         # Do not hold reference to temporary data
         self.scene = None
@@ -429,6 +689,10 @@ class Exporter(object):
         print("[Exporter] Update because of:", Change.to_string(changes))
         # Invalidate node cache
         self.node_cache.clear()
+        # Materials might have been edited or removed from the LuxCore scene
+        self.material_export_cache.clear()
+        if self.node_tree_flags.diff(depsgraph):
+            self.node_tree_flags.clear()
 
         if changes & Change.CONFIG:
             # We already converted the new config settings during
@@ -469,6 +733,7 @@ class Exporter(object):
 
         # Do not hold reference to temporary data
         self.scene = None
+        LuxCoreErrorLog.refresh_ui()
 
         # We have to return and re-assign the session in the RenderEngine,
         # because it might have been replaced in _update_config()
@@ -541,6 +806,107 @@ class Exporter(object):
 
         return props
 
+    def check_props_batch(self, luxcore_scene, scene_props):
+        """
+        Called after each converted object in first_run(). The scene props
+        collected so far are parsed into the LuxCore scene and cleared when the
+        batch size is reached, or when Blender uses more memory than the budget.
+        This way they don't accumulate into one huge parse at the end of the export.
+
+        The props of an object are complete when this is called, and materials
+        are only converted the first time they are used by an object, so they are
+        always parsed in the same batch as the first object using them, or earlier.
+        Within a batch, LuxCore parses textures and materials before the objects.
+        """
+        if not (self.props_batch_size or self.memory_budget):
+            return
+        self.objects_in_batch += 1
+
+        batch_full = self.props_batch_size and self.objects_in_batch >= self.props_batch_size
+        over_budget = (
+            self.memory_budget
+            and self.objects_in_batch >= MIN_OBJECTS_PER_BATCH
+            and utils_memory.get_resident() >= self.memory_budget
+        )
+        if not (batch_full or over_budget):
+            return
+
+        if self.mesh_pool:
+            # The shapes in the props reference meshes that might not be defined yet
+            self.mesh_pool.wait()
+        self._parse_props_batch(luxcore_scene, scene_props)
+        scene_props.Clear()
+
+    def lock_scene(self):
+        """
+        While the mesh worker threads define meshes, every call on the main
+        thread that changes the LuxCore scene has to hold this lock
+        (the LuxCore scene is not thread-safe).
+        Parse() is only called after waiting for the workers.
+        """
+        if self.mesh_pool:
+            return self.mesh_pool.define_lock
+        return nullcontext()
+
+    def _get_used_images(self, depsgraph):
+        """
+        Images used by the materials, lights and world in the depsgraph, found
+        without converting them. Volumes are not searched, their images are
+        written when they are exported.
+        """
+        images = {}
+        for id in depsgraph.ids:
+            original = id.original
+            node_trees = []
+            extra_images = []
+
+            if isinstance(original, bpy.types.Material):
+                if original.luxcore.use_cycles_nodes or (not original.luxcore.node_tree and original.library):
+                    node_trees.append(original.node_tree)
+                else:
+                    node_trees.append(original.luxcore.node_tree)
+            elif isinstance(original, bpy.types.Light):
+                node_trees.append(original.luxcore.node_tree)
+                extra_images.append(original.luxcore.image)
+            elif isinstance(original, bpy.types.World):
+                if original.luxcore.use_cycles_settings:
+                    node_trees.append(original.node_tree)
+                else:
+                    extra_images.append(original.luxcore.image)
+
+            for node_tree in node_trees:
+                if node_tree:
+                    extra_images += self.node_tree_flags.get(node_tree).images
+            for image in extra_images:
+                if image:
+                    images[image.as_pointer()] = image
+        return images.values()
+
+    def _parse_props_batch(self, luxcore_scene, scene_props):
+        start = time()
+        with self.memory_phases.measure("parse"):
+            luxcore_scene.Parse(scene_props)
+        parse_time = time() - start
+
+        self.props_parse_time += parse_time
+        self.props_batch_count += 1
+        if self.props_batch_size or self.memory_budget:
+            print(
+                f"[Exporter] Parsed scene props batch {self.props_batch_count} "
+                f"({self.objects_in_batch} objects) in {parse_time:.3f} s"
+            )
+        self.objects_in_batch = 0
+
+    def _set_memory_stats(self, stats):
+        stats.export_memory.value = (utils_memory.get_resident(), utils_memory.get_peak())
+        stats.memory_meshes.value = self.memory_phases.get("meshes")
+        stats.memory_hair.value = self.memory_phases.get("hair")
+        stats.memory_instancing.value = self.memory_phases.get("instancing")
+        stats.memory_materials.value = self.memory_phases.get("materials")
+        stats.memory_parse.value = self.memory_phases.get("parse")
+        stats.props_parse_time.value = self.props_parse_time
+        stats.props_batch_count.value = self.props_batch_count
+
     def _init_stats(self, stats, config_props, scene):
         render_engine = config_props.Get("renderengine.type").GetString()
         stats.render_engine.value = utils_render.engine_to_str(render_engine)
@@ -1,41 +1,134 @@
+import hashlib
 import bpy
 from ... import utils
 from ...utils import EXPORTABLE_OBJECTS
 from .. import camera, material
 
 from .object_cache import ObjectCache2, supports_live_transform
+from . import mesh_cache
+from .mesh_cache import MeshDiskCache
+from .node_tree_flags import NodeTreeFlagsCache
 
 
-class StringCache:
+def _make_digest(string):
+    return hashlib.blake2b(string.encode(), digest_size=16).digest()
+
+
+class DigestCache:
+    """
+    Detects changes of converted props by comparing a digest of their string
+    representation with the one of the previous props (which are not converted
+    to a string again).
+    """
+
     def __init__(self):
         self.props = None
+        self.digest = None
 
     def diff(self, new_props):
-        props_str = str(self.props)
-        new_props_str = str(new_props)
+        digest = _make_digest(str(new_props))
+        # Always true if not initialized yet
+        has_changes = digest != self.digest
+        self.digest = digest
+        self.props = new_props
+        return has_changes
 
-        if self.props is None:
-            # Not initialized yet
-            self.props = new_props
-            return True
+    def diff_definitions(self, prefix, definitions):
+        """
+        Like diff(), but takes the prefix and definitions that would be passed to
+        utils.luxutils.create_props(). The props are only created if something changed.
+        """
+        digest = _make_digest(prefix + repr(definitions))
+        if digest == self.digest:
+            return False
+        self.digest = digest
+        self.props = utils.luxutils.create_props(prefix, definitions)
+        return True
+
+
+class SessionPropsUpdates:
+    """
+    Counts the depsgraph updates that may affect the imagepipeline and halt
+    condition props, see handlers/depsgraph_update_post.py. The final render loop
+    has no depsgraph that receives updates, it only converts these props again
+    if the count changed.
+    """
+
+    ID_TYPES = ("SCENE", "CAMERA", "IMAGE")
+    count = 0
+
+    @classmethod
+    def check(cls, depsgraph):
+        if depsgraph is None or any(depsgraph.id_type_updated(id_type) for id_type in cls.ID_TYPES):
+            cls.count += 1
+
+
+def _get_view_fingerprint(context):
+    region_data = context.region_data
+    space = context.space_data
+    return (
+        context.region.width,
+        context.region.height,
+        region_data.view_perspective,
+        region_data.view_matrix.copy(),
+        region_data.view_distance,
+        region_data.view_camera_zoom,
+        tuple(region_data.view_camera_offset),
+        space.lens,
+        space.clip_start,
+        space.clip_end,
+        space.camera.as_pointer() if space.camera else 0,
+        space.shading.type,
+        space.use_render_border,
+        space.render_border_min_x,
+        space.render_border_max_x,
+        space.render_border_min_y,
+        space.render_border_max_y,
+    )
+
+
+class ViewFingerprintCache:
+    """
+    Fingerprint of the viewport inputs of config.convert() and camera.convert()
+    that can change without a depsgraph update (region size, view matrix and the
+    settings of the 3D view). Changes of these only cause a view_draw() call.
+    All other inputs are properties of IDs (scene, camera etc.), their changes
+    cause a view_update() call, which has to call invalidate().
+    """
 
-        has_changes = props_str != new_props_str
-        self.props = new_props
+    def __init__(self):
+        self.fingerprint = None
+        # Instrumentation of the change detection in view_draw()
+        self.redraw_count = 0
+        self.conversion_count = 0
+        self.check_time = 0
+
+    def invalidate(self):
+        self.fingerprint = None
+
+    def diff(self, context):
+        fingerprint = _get_view_fingerprint(context)
+        has_changes = fingerprint != self.fingerprint
+        self.fingerprint = fingerprint
         return has_changes
 
+    def get_average_overhead(self):
+        """Average time spent on change detection per view_draw() call, in seconds"""
+        return self.check_time / max(1, self.redraw_count)
+
 
 class CameraCache:
     def __init__(self):
-        self.string_cache = StringCache()
+        self.digest_cache = DigestCache()
 
     @property
     def props(self):
-        return self.string_cache.props
+        return self.digest_cache.props
 
     def diff(self, exporter, scene, depsgraph, context):
-        # String cache
+        # Digest cache
         camera_props = camera.convert(exporter, scene, depsgraph, context)
-        has_changes = self.string_cache.diff(camera_props)
+        has_changes = self.digest_cache.diff(camera_props)
 
         # Check camera object and data for changes
         # Needed in case the volume node tree was relinked/unlinked
@@ -65,6 +158,33 @@ class MaterialCache:
         self.changed_materials.clear()
 
 
+class MaterialExportCache:
+    """
+    LuxCore names of the materials that were already converted during one export.
+    A material used by many objects is only converted (and its props merged
+    into the scene props) once.
+    """
+
+    def __init__(self):
+        self.names = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, mat):
+        lux_mat_name = self.names.get(mat.as_pointer())
+        if lux_mat_name is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return lux_mat_name
+
+    def add(self, mat, lux_mat_name):
+        self.names[mat.as_pointer()] = lux_mat_name
+
+    def clear(self):
+        self.names.clear()
+
+
 class VisibilityCache:
     def __init__(self):
         # sets containing keys
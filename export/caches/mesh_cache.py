@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+from ...utils.disk_cache import DiskCache
+
+# Increment when the layout of the cached buffers or the key computation changes
+CACHE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+# Keys of the per-part arrays that hold a list of arrays (one per layer)
+LAYERED_ARRAYS = {"uvs", "colors", "alphas"}
+
+
+def _update_digest(digest, bpy_collection, attr, stride, dtype):
+    count = len(bpy_collection)
+    buffer = np.empty(count * stride, dtype=dtype)
+    bpy_collection.foreach_get(attr, buffer)
+    digest.update(attr.encode())
+    digest.update(buffer.tobytes())
+
+
+def make_key(obj, mesh, partition):
+    """
+    Hash the evaluated mesh (before split_faces()) and the modifier stack.
+    Only raw data is read here, the expensive derived data (normals,
+    split vertices, per-material triangle lists) is what the cache stores.
+    partition is part of the key because it changes the stored layout.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{CACHE_VERSION}{partition}".encode())
+
+    for modifier in obj.modifiers:
+        digest.update(f"{modifier.type}{modifier.name}{modifier.show_render}".encode())
+
+    _update_digest(digest, mesh.vertices, "co", 3, np.float32)
+    _update_digest(digest, mesh.edges, "use_edge_sharp", 1, bool)
+    _update_digest(digest, mesh.loops, "vertex_index", 1, np.int32)
+    _update_digest(digest, mesh.polygons, "loop_start", 1, np.int32)
+    _update_digest(digest, mesh.polygons, "material_index", 1, np.int32)
+    _update_digest(digest, mesh.polygons, "use_smooth", 1, bool)
+
+    if mesh.has_custom_normals:
+        _update_digest(digest, mesh.loops, "normal", 3, np.float32)
+
+    for uv_layer in mesh.uv_layers:
+        digest.update(uv_layer.name.encode())
+        _update_digest(digest, uv_layer.uv, "vector", 2, np.float32)
+
+    for color_attribute in mesh.color_attributes:
+        digest.update(color_attribute.name.encode())
+        _update_digest(digest, color_attribute.data, "color_srgb", 4, np.float32)
+
+    return digest.hexdigest()
+
+
+class MeshDiskCache:
+    """
+    Persistent cache of converted mesh buffers, keyed by make_key().
+    Used during final render to skip the mesh data extraction for meshes
+    that did not change since the last render or frame.
+
+    Each entry stores a list of parts: (material index, {name: array}),
+    where the arrays correspond to the arguments of DefineMeshExt().
+    Arrays shared by several parts are only stored once.
+    """
+
+    def __init__(self, root, max_size=0):
+        self.disk_cache = DiskCache(root, max_size)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, key):
+        path = self.disk_cache.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+
+        try:
+            with open(os.path.join(path, MANIFEST_NAME)) as manifest_file:
+                manifest = json.load(manifest_file)
+
+            if manifest["version"] != CACHE_VERSION:
+                self.misses += 1
+                return None
+
+            # Copy-on-write mapping: the arrays are read lazily from the file,
+            # but can still be passed to functions that expect writable buffers
+            loaded = {}
+
+            def _load(filename):
+                if filename not in loaded:
+                    loaded[filename] = np.load(os.path.join(path, filename), mmap_mode="c")
+                return loaded[filename]
+
+            parts = []
+            for mat_index, part_manifest in manifest["parts"]:
+                arrays = {}
+                for name, filenames in part_manifest.items():
+                    if name in LAYERED_ARRAYS:
+                        arrays[name] = [_load(filename) for filename in filenames]
+                    else:
+                        arrays[name] = _load(filenames)
+                parts.append((mat_index, arrays))
+        except (OSError, ValueError, KeyError) as error:
+            print(f"[Mesh Cache] Could not load entry {key}: {error}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return parts
+
+    def save(self, key, parts):
+        temp_path = self.disk_cache.begin_write(key)
+        try:
+            # Map id(array) -> filename so shared arrays are only written once
+            written = {}
+
+            def _save(array):
+                filename = written.get(id(array))
+                if filename is None:
+                    filename = f"{len(written)}.npy"
+                    np.save(os.path.join(temp_path, filename), np.ascontiguousarray(array))
+                    written[id(array)] = filename
+                return filename
+
+            parts_manifest = []
+            for mat_index, arrays in parts:
+                part_manifest = {}
+                for name, value in arrays.items():
+                    if name in LAYERED_ARRAYS:
+                        part_manifest[name] = [_save(array) for array in value]
+                    else:
+                        part_manifest[name] = _save(value)
+                parts_manifest.append((int(mat_index), part_manifest))
+
+            manifest = {"version": CACHE_VERSION, "parts": parts_manifest}
+            with open(os.path.join(temp_path, MANIFEST_NAME), "w") as manifest_file:
+                json.dump(manifest, manifest_file)
+        except OSError as error:
+            print(f"[Mesh Cache] Could not save entry {key}: {error}")
+            self.disk_cache.abort(temp_path)
+            return
+
+        self.disk_cache.commit(key, temp_path)
+
+    def evict(self):
+        return self.disk_cache.evict()
@@ -0,0 +1,121 @@
+from ...utils.errorlog import LuxCoreErrorLog
+
+RANDOM_SEED_MAPPING_TYPES = {"uvrandommapping2d", "localrandommapping3d"}
+DISPLACEMENT_NODES = {
+    "LuxCoreNodeShapeHeightDisplacement",
+    "LuxCoreNodeShapeVectorDisplacement",
+}
+# Nodes whose output can change with the frame without any keyframes
+FRAME_DEPENDENT_NODES = {"LuxCoreNodeTexOpenVDB", "LuxCoreNodeTexTimeInfo"}
+IMAGE_NODES = {"LuxCoreNodeTexImagemap", "ShaderNodeTexImage", "ShaderNodeTexEnvironment"}
+FRAME_DEPENDENT_IMAGE_SOURCES = {"SEQUENCE", "MOVIE"}
+
+
+class NodeTreeFlags:
+    """
+    Properties of a node tree that require extra shapes or mesh settings during export,
+    or a new export in every frame of an animation, and the images used by the tree.
+    All flags are found in one traversal of the tree (following pointer nodes and,
+    in Cycles node trees, node groups).
+    """
+
+    __slots__ = (
+        "pointiness",
+        "random_per_island_float",
+        "random_per_island_int",
+        "edge_detector",
+        "displacement",
+        "frame_dependent",
+        "images",
+    )
+
+    def __init__(self, node_tree):
+        # TODO better check would be if the nodes are linked to the output and actually used
+        self.pointiness = False
+        self.random_per_island_float = False
+        self.random_per_island_int = False
+        self.edge_detector = False
+        self.displacement = False
+        # Animated, or uses image sequences or other frame dependent nodes
+        self.frame_dependent = False
+        # Images of the image nodes, used to write packed images before the export
+        self.images = []
+
+        self._scan(node_tree, path=set(), visited=set())
+
+    def _scan(self, node_tree, path, visited):
+        pointer = node_tree.as_pointer()
+        path.add(pointer)
+        visited.add(pointer)
+
+        if node_tree.animation_data:
+            self.frame_dependent = True
+
+        for node in node_tree.nodes:
+            bl_idname = node.bl_idname
+
+            if bl_idname == "LuxCoreNodeTreePointer":
+                sub_tree = node.node_tree
+                if not sub_tree:
+                    continue
+                sub_pointer = sub_tree.as_pointer()
+                if sub_pointer in path:
+                    msg = (f'Pointer nodes in node trees "{node_tree.name}" and "{sub_tree.name}" '
+                           "create a dependency cycle! Delete one of them.")
+                    LuxCoreErrorLog.add_error(msg)
+                    # Mark the faulty nodes in red
+                    node.use_custom_color = True
+                    node.color = (0.9, 0, 0)
+                elif sub_pointer not in visited:
+                    # Trees used by several pointer nodes are only scanned once
+                    self._scan(sub_tree, path, visited)
+            elif bl_idname == "ShaderNodeGroup":
+                # Blender does not allow recursive node groups
+                sub_tree = node.node_tree
+                if sub_tree and sub_tree.as_pointer() not in visited:
+                    self._scan(sub_tree, path, visited)
+            elif bl_idname in IMAGE_NODES:
+                if node.image:
+                    self.images.append(node.image)
+                    if node.image.source in FRAME_DEPENDENT_IMAGE_SOURCES:
+                        self.frame_dependent = True
+            elif bl_idname in FRAME_DEPENDENT_NODES:
+                self.frame_dependent = True
+            elif bl_idname == "LuxCoreNodeTexPointiness":
+                self.pointiness = True
+            elif bl_idname == "LuxCoreNodeTexRandomPerIsland":
+                self.random_per_island_float = True
+            elif bl_idname in {"LuxCoreNodeTexMapping2D", "LuxCoreNodeTexMapping3D"}:
+                if node.mapping_type in RANDOM_SEED_MAPPING_TYPES and node.seed_type == "mesh_islands":
+                    self.random_per_island_int = True
+            elif bl_idname == "LuxCoreNodeTexWireframe":
+                if node.hide_planar_edges:
+                    self.edge_detector = True
+            elif bl_idname in DISPLACEMENT_NODES:
+                self.displacement = True
+
+        path.remove(pointer)
+
+
+class NodeTreeFlagsCache:
+    """
+    NodeTreeFlags of all node trees used during one export, keyed by node tree.
+    Has to be cleared when materials or node trees are edited (viewport render).
+    """
+
+    def __init__(self):
+        self._flags = {}
+
+    def get(self, node_tree):
+        key = node_tree.as_pointer()
+        flags = self._flags.get(key)
+        if flags is None:
+            flags = NodeTreeFlags(node_tree)
+            self._flags[key] = flags
+        return flags
+
+    def diff(self, depsgraph):
+        return depsgraph.id_type_updated("MATERIAL") or depsgraph.id_type_updated("NODETREE")
+
+    def clear(self):
+        self._flags.clear()
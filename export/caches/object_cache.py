@@ -1,5 +1,6 @@
 import bpy
-from array import array
+import hashlib
+import numpy as np
 from functools import lru_cache
 from time import time
 
@@ -14,11 +15,11 @@ from ..hair import (
     get_hair_material_index,
     convert_hair_curves,
 )
-from .exported_data import ExportedObject, ExportedPart
+from .exported_data import ExportedObject, ExportedPart, ExportedLight
+from .node_tree_flags import FRAME_DEPENDENT_IMAGE_SOURCES
 from .. import light, material
 from ...utils.errorlog import LuxCoreErrorLog
-from ...utils import node as utils_node
-from ...utils import MESH_OBJECTS
+from ...utils import MESH_OBJECTS, EXPORTABLE_OBJECTS
 from ...utils.node import get_active_output
 
 
@@ -30,55 +31,13 @@ class TriAOVDataIndices:
 MAX_PARTICLES_FOR_LIVE_TRANSFORM = 2000
 
 
-def uses_pointiness(node_tree):
-    # TODO better check would be if the node is linked to the output and actually used
-    return utils_node.has_nodes(node_tree, "LuxCoreNodeTexPointiness", True)
-
-
-def uses_random_per_island_uniform_float(node_tree):
-    # TODO better check would be if the node is linked to the output and actually used
-    return utils_node.has_nodes(
-        node_tree, "LuxCoreNodeTexRandomPerIsland", True
-    )
-
-
-def uses_random_per_island_int(node_tree):
-    # TODO better check would be if the node is linked to the output and actually used
-    for node in utils_node.find_nodes_multi(
-        node_tree, {"LuxCoreNodeTexMapping2D", "LuxCoreNodeTexMapping3D"}, True
-    ):
-        if (
-            node.mapping_type in {"uvrandommapping2d", "localrandommapping3d"}
-            and node.seed_type == "mesh_islands"
-        ):
-            return True
-    return False
-
-
-def needs_edge_detector_shape(node_tree):
-    # TODO better check would be if the node is linked to the output and actually used
-    for node in utils_node.find_nodes(
-        node_tree, "LuxCoreNodeTexWireframe", True
-    ):
-        if node.hide_planar_edges:
-            return True
-    return False
-
-
-def uses_displacement(obj):
+def uses_displacement(obj, node_tree_flags):
     for mat_slot in obj.material_slots:
         mat = mat_slot.material
         if (
             mat
             and mat.luxcore.node_tree
-            and utils_node.has_nodes_multi(
-                mat.luxcore.node_tree,
-                {
-                    "LuxCoreNodeShapeHeightDisplacement",
-                    "LuxCoreNodeShapeVectorDisplacement",
-                },
-                True,
-            )
+            and node_tree_flags.get(mat.luxcore.node_tree).displacement
         ):
             return True
     return False
@@ -95,8 +54,9 @@ def define_shapes(input_shape, node_tree, exporter, depsgraph, scene_props):
         )
 
     # Add some shapes at the end that are required by some nodes in the node tree
+    flags = exporter.node_tree_flags.get(node_tree)
 
-    if uses_pointiness(node_tree):
+    if flags.pointiness:
         # Note: Since Blender still does not make use of the vertex alpha channel
         # as of 2.82, we use it to store the pointiness information.
         pointiness_shape = input_shape + "_pointiness"
@@ -105,10 +65,8 @@ def define_shapes(input_shape, node_tree, exporter, depsgraph, scene_props):
         scene_props.Set(pyluxcore.Property(prefix + "source", shape))
         shape = pointiness_shape
 
-    _uses_random_per_island_uniform_float = (
-        uses_random_per_island_uniform_float(node_tree)
-    )
-    _uses_random_per_island_int = uses_random_per_island_int(node_tree)
+    _uses_random_per_island_uniform_float = flags.random_per_island_float
+    _uses_random_per_island_int = flags.random_per_island_int
     if _uses_random_per_island_uniform_float or _uses_random_per_island_int:
         island_aov_index = TriAOVDataIndices.RANDOM_PER_ISLAND_INT
 
@@ -144,7 +102,7 @@ def define_shapes(input_shape, node_tree, exporter, depsgraph, scene_props):
             )
             shape = random_tri_aov_shape
 
-    if needs_edge_detector_shape(node_tree):
+    if flags.edge_detector:
         edge_detector_shape = input_shape + "_edge_detector"
         prefix = "scene.shapes." + edge_detector_shape + "."
         scene_props.Set(pyluxcore.Property(prefix + "type", "edgedetectoraov"))
@@ -215,17 +173,68 @@ def export_material(
         # We need the original material, not the evaluated one, otherwise
         # Blender gives us "NodeTreeUndefined" as mat.node_tree.bl_idname
         mat = mat.original
-
-        lux_mat_name, mat_props = material.convert(
-            exporter, depsgraph, mat, is_viewport_render, obj.name
-        )
         node_tree = mat.luxcore.node_tree
+
+        lux_mat_name = exporter.material_export_cache.get(mat)
+        if lux_mat_name is not None:
+            # Already converted for another object, the props are already in the scene props
+            return lux_mat_name, pyluxcore.Properties(), node_tree
+
+        with exporter.memory_phases.measure("materials"):
+            lux_mat_name, mat_props = material.convert(
+                exporter, depsgraph, mat, is_viewport_render, obj.name
+            )
+        exporter.material_export_cache.add(mat, lux_mat_name)
         return lux_mat_name, mat_props, node_tree
     else:
         lux_mat_name, mat_props = material.fallback()
         return lux_mat_name, mat_props, None
 
 
+def _geometry_may_change(obj):
+    """
+    Used when reusing a scene for the next animation frame: True if the geometry
+    of the object can change without a new transformation.
+    """
+    if obj.type == "META":
+        # Depends on the other metaball objects
+        return True
+    original = obj.original
+    if utils.has_deforming_modifiers(original):
+        return True
+    data = original.data
+    if getattr(data, "bevel_object", None) or getattr(data, "taper_object", None):
+        return True
+    return bool(getattr(data, "shape_keys", None) or data.animation_data)
+
+
+def _get_geometry_fingerprint(obj):
+    """
+    Hash of the vertex positions and element counts of the evaluated mesh, to find out
+    if the geometry changed between two animation frames. None if the geometry can't
+    change or can't be compared (non-mesh objects are exported again if they may change).
+    """
+    if obj.type != "MESH" or not _geometry_may_change(obj):
+        return None
+    mesh = obj.data
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions_hash = hashlib.blake2b(positions.tobytes(), digest_size=16).digest()
+    return len(mesh.polygons), len(mesh.loops), positions_hash
+
+
+def _light_may_change(obj, node_tree_flags):
+    """True if the light can change between animation frames without a new transformation"""
+    light = obj.original.data
+    if light.animation_data:
+        return True
+    image = light.luxcore.image
+    if image and image.source in FRAME_DEPENDENT_IMAGE_SOURCES:
+        return True
+    node_trees = (light.node_tree, light.luxcore.node_tree, light.luxcore.volume)
+    return any(node_tree and node_tree_flags.get(node_tree).frame_dependent for node_tree in node_trees)
+
+
 def make_psys_key(obj, psys, is_instance):
     psys_lib_name = psys.settings.library.name if psys.settings.library else ""
     return obj.name_full + psys.name + psys_lib_name + str(is_instance)
@@ -289,13 +298,131 @@ def get_obj_count_estimate(depsgraph):
 
 
 class Duplis:
-    def __init__(self, exported_obj):
+    """
+    Collects the matrices and object IDs of all instances of one exported object
+    in preallocated buffers, which are grown by doubling if the estimate was too small.
+    """
+
+    MIN_CAPACITY = 64
+    # The particle count is only an upper bound (e.g. when a collection is instanced,
+    # the particles are distributed over its objects), so don't trust it blindly
+    MAX_INITIAL_CAPACITY = 1 << 16
+
+    def __init__(self, exported_obj, obj_id=-1, capacity_estimate=0, track_identities=False):
         self.exported_obj = exported_obj
-        self.matrices = array("f", [])
-        self.object_ids = array("I", [])
+        # If the user did not choose an ID, a random one is used for each instance
+        self.obj_id = obj_id
+        capacity = min(
+            max(self.MIN_CAPACITY, int(capacity_estimate)),
+            self.MAX_INITIAL_CAPACITY,
+        )
+        self.count = 0
+        self.matrices = np.empty((capacity, 4, 4), dtype=np.float32)
+        self.object_ids = np.empty(capacity, dtype=np.uint32)
+
+        # Motion blur: one (count, 4, 4) matrix array per step, filled by motion_blur.convert()
+        self.motion_times = None
+        self.motion_matrices = []
+        self._step_matrices = None
+        self._step_captured = None
+        # {utils.get_instance_identity(): index}, to find the instances in the motion steps
+        self.indices = {} if track_identities else None
+        # False if the instances changed between the motion steps
+        self.motion_valid = True
+
+    def add(self, dg_obj_instance):
+        index = self.count
+        if index == len(self.object_ids):
+            self._grow()
+
+        # Assigning the matrix reads its values right away, so unlike with
+        # BlenderMatrix4x4ToList(), no copy of matrix_world is needed
+        self.matrices[index] = dg_obj_instance.matrix_world
+        if self.obj_id == -1:
+            self.object_ids[index] = dg_obj_instance.random_id & 0xFFFFFFFE
+        else:
+            self.object_ids[index] = self.obj_id
+        if self.indices is not None:
+            self.indices[utils.get_instance_identity(dg_obj_instance)] = index
+        self.count = index + 1
+
+    def _grow(self):
+        capacity = 2 * len(self.object_ids)
+        matrices = np.empty((capacity, 4, 4), dtype=np.float32)
+        matrices[: self.count] = self.matrices[: self.count]
+        self.matrices = matrices
+        object_ids = np.empty(capacity, dtype=np.uint32)
+        object_ids[: self.count] = self.object_ids[: self.count]
+        self.object_ids = object_ids
 
     def get_count(self):
-        return len(self.object_ids)
+        return self.count
+
+    def get_transformations(self):
+        # LuxCore expects column-major matrices (same layout as BlenderMatrix4x4ToList())
+        return np.ascontiguousarray(
+            self.matrices[: self.count].transpose(0, 2, 1)
+        ).ravel()
+
+    def get_object_ids(self):
+        return self.object_ids[: self.count]
+
+    def begin_motion_step(self):
+        self._step_matrices = np.empty((self.count, 4, 4), dtype=np.float32)
+        self._step_captured = np.zeros(self.count, dtype=bool)
+        if self.indices is None or len(self.indices) != self.count:
+            # Not tracked, or instances with the same persistent ID
+            self.motion_valid = False
+
+    def add_motion_matrix(self, dg_obj_instance, use_motion_blur):
+        """
+        Add the matrix of an instance in the current motion step. The instance is
+        matched by its persistent ID, particles can be born or die between the steps.
+        If use_motion_blur is False, the instance does not move.
+        """
+        if not self.motion_valid:
+            return
+        index = self.indices.get(utils.get_instance_identity(dg_obj_instance))
+        if index is None:
+            # Not present in first_run(), e.g. a particle that was born
+            self.motion_valid = False
+            return
+        if use_motion_blur:
+            self._step_matrices[index] = dg_obj_instance.matrix_world
+        else:
+            self._step_matrices[index] = self.matrices[index]
+        self._step_captured[index] = True
+
+    def end_motion_step(self):
+        if not self._step_captured.all():
+            # E.g. a particle that died
+            self.motion_valid = False
+        self.motion_matrices.append(self._step_matrices)
+        self._step_matrices = None
+        self._step_captured = None
+
+    def has_motion(self):
+        if not self.motion_valid or len(self.motion_matrices) < 2:
+            return False
+        first_step = self.motion_matrices[0]
+        return any(
+            not np.array_equal(first_step, step_matrices)
+            for step_matrices in self.motion_matrices[1:]
+        )
+
+    def get_motion_transformations(self):
+        """
+        Returns (times, transformations) for all instances and steps,
+        ordered by instance, then by step (as expected by DuplicateObject())
+        """
+        steps = len(self.motion_matrices)
+        times = np.tile(np.asarray(self.motion_times, dtype=np.float32), self.count)
+        # (steps, count, 4, 4) -> (count, steps, 4, 4), column-major matrices
+        stacked = np.stack(self.motion_matrices)
+        transformations = np.ascontiguousarray(
+            stacked.transpose(1, 0, 3, 2)
+        ).ravel()
+        return steps, times, transformations
 
 
 class ObjectCache2:
@@ -303,6 +430,17 @@ class ObjectCache2:
         self.exported_objects = {}
         self.exported_meshes = {}
         self.exported_hair = {}
+        # {utils.get_instance_identity(): obj_key} of the objects exported in a
+        # final render, used to look up the exported objects during motion blur sampling
+        self.instance_index = {}
+        # {original object pointer: {obj_key, ...}}, the keys of all exported instances of an
+        # object, registered under the object itself and under the parent (instancer)
+        self.instance_keys_by_object = {}
+        # Time spent in first_run() on collecting duplis (excluding object conversion)
+        self.dupli_collection_time = 0
+        # Animation render with a reused scene: {obj_key: (matrix_world, geometry fingerprint)}
+        # of the exported objects and lights, compared in update_frame()
+        self.frame_states = {}
 
     def first_run(
         self,
@@ -316,6 +454,8 @@ class ObjectCache2:
     ):
         is_viewport_render = bool(context)
         instances = {}
+        start_time = time()
+        convert_time = 0
 
         if engine:
             obj_count_estimate = max(1, get_obj_count_estimate(depsgraph))
@@ -354,17 +494,7 @@ class ObjectCache2:
                     duplis = instances[obj.original.as_pointer()]
                     # If duplis is None, then a non-exportable object like a curve with zero faces is being duplicated
                     if duplis:
-                        obj_id = dg_obj_instance.object.original.luxcore.id
-                        if obj_id == -1:
-                            obj_id = dg_obj_instance.random_id & 0xFFFFFFFE
-                        duplis.object_ids.append(obj_id)
-                        # We need a copy of matrix_world here, not sure why, but if we don't
-                        # make a copy, we only get an identity matrix in C++
-                        duplis.matrices.extend(
-                            pyluxcore.BlenderMatrix4x4ToList(
-                                dg_obj_instance.matrix_world.copy()
-                            )
-                        )
+                        duplis.add(dg_obj_instance)
                 except KeyError:
                     if engine:
                         if engine.test_break():
@@ -376,6 +506,7 @@ class ObjectCache2:
                             index,
                             obj_count_estimate,
                         )
+                    convert_start = time()
                     exported_obj = self._convert_obj(
                         exporter,
                         dg_obj_instance,
@@ -387,11 +518,21 @@ class ObjectCache2:
                         view_layer,
                         engine,
                     )
+                    convert_time += time() - convert_start
+                    exporter.check_props_batch(luxcore_scene, scene_props)
                     if exported_obj:
                         # Note, the transformation matrix and object ID of this first instance is not added
                         # to the duplication list, since it already exists in the scene
                         instances[obj.original.as_pointer()] = Duplis(
-                            exported_obj
+                            exported_obj,
+                            obj.original.luxcore.id,
+                            get_total_particle_count(
+                                dg_obj_instance.particle_system,
+                                is_viewport_render,
+                            )
+                            if dg_obj_instance.particle_system
+                            else 0,
+                            exporter.motion_blur_enabled,
                         )
                     else:
                         # Could not export the object, happens e.g. with curve objects with zero faces
@@ -410,6 +551,7 @@ class ObjectCache2:
                         engine, obj.name, "", index, obj_count_estimate
                     )
 
+                convert_start = time()
                 self._convert_obj(
                     exporter,
                     dg_obj_instance,
@@ -421,7 +563,12 @@ class ObjectCache2:
                     view_layer,
                     engine,
                 )
+                convert_time += time() - convert_start
+                exporter.check_props_batch(luxcore_scene, scene_props)
 
+        self.dupli_collection_time = time() - start_time - convert_time
+        # Warnings of the converted objects
+        LuxCoreErrorLog.refresh_ui()
         # self._debug_info()
         return instances
 
@@ -431,6 +578,7 @@ class ObjectCache2:
         objects are available for luxcore_scene. Needs to happen before this method is called.
         """
         start_time = time()
+        instance_count = 0
 
         for duplis in instances.values():
             if duplis is None:
@@ -441,24 +589,52 @@ class ObjectCache2:
                 # Only one instance was created (and is already present in the luxcore_scene), nothing to duplicate
                 continue
 
+            object_ids = duplis.get_object_ids()
+            instance_count += duplis.get_count()
+
+            if duplis.has_motion():
+                steps, times, transformations = (
+                    duplis.get_motion_transformations()
+                )
+            else:
+                if not duplis.motion_valid:
+                    LuxCoreErrorLog.add_warning(
+                        "Instances change during the shutter time, "
+                        "motion blur disabled for the instances",
+                        obj_name=duplis.exported_obj.parts[0].lux_obj,
+                    )
+                steps = 0
+                transformations = duplis.get_transformations()
+
             for part in duplis.exported_obj.parts:
                 src_name = part.lux_obj
                 dst_name = src_name + "dupli"
-                luxcore_scene.DuplicateObject(
-                    src_name,
-                    dst_name,
-                    duplis.get_count(),
-                    duplis.matrices,
-                    duplis.object_ids,
-                )
-
-                # TODO: support steps and times (motion blur)
-                # steps = 0 # TODO
-                # times = array("f", [])
-                # luxcore_scene.DuplicateObject(src_name, dst_name, count, steps, times, transformations)
+                if steps:
+                    luxcore_scene.DuplicateObject(
+                        src_name,
+                        dst_name,
+                        duplis.get_count(),
+                        steps,
+                        times,
+                        transformations,
+                        object_ids,
+                    )
+                else:
+                    luxcore_scene.DuplicateObject(
+                        src_name,
+                        dst_name,
+                        duplis.get_count(),
+                        transformations,
+                        object_ids,
+                    )
 
         if stats:
-            stats.export_time_instancing.value = time() - start_time
+            instancing_time = time() - start_time
+            stats.export_time_instancing.value = instancing_time
+            stats.instance_count.value = instance_count
+            total_time = instancing_time + self.dupli_collection_time
+            if instance_count and total_time > 0:
+                stats.instancing_rate.value = instance_count / total_time
 
     def _debug_info(self):
         print("Objects in cache:", len(self.exported_objects))
@@ -516,14 +692,15 @@ class ObjectCache2:
                         is_for_duplication = (
                             is_viewport_render or dg_obj_instance.is_instance
                         )
-                        lux_shape = convert_hair_curves(
-                            exporter,
-                            depsgraph,
-                            obj,
-                            obj_key,
-                            luxcore_scene,
-                            is_for_duplication,
-                        )
+                        with exporter.memory_phases.measure("hair"):
+                            lux_shape = convert_hair_curves(
+                                exporter,
+                                depsgraph,
+                                obj,
+                                obj_key,
+                                luxcore_scene,
+                                is_for_duplication,
+                            )
                         if lux_shape:
                             mat = obj.data.materials[0]
                             if mat:
@@ -574,6 +751,7 @@ class ObjectCache2:
                         scene_props,
                         is_viewport_render,
                         view_layer,
+                        engine,
                     )
                 if exported_stuff:
                     props = exported_stuff.get_props()
@@ -612,20 +790,21 @@ class ObjectCache2:
                 try:
                     lux_shape = self.exported_hair[psys_key]
                 except KeyError:
-                    lux_shape = convert_hair(
-                        exporter,
-                        obj,
-                        obj_key,
-                        psys,
-                        depsgraph,
-                        luxcore_scene,
-                        scene_props,
-                        is_viewport_render,
-                        is_for_duplication,
-                        dg_obj_instance.matrix_world,
-                        visible_to_cam,
-                        engine,
-                    )
+                    with exporter.memory_phases.measure("hair"):
+                        lux_shape = convert_hair(
+                            exporter,
+                            obj,
+                            obj_key,
+                            psys,
+                            depsgraph,
+                            luxcore_scene,
+                            scene_props,
+                            is_viewport_render,
+                            is_for_duplication,
+                            dg_obj_instance.matrix_world,
+                            visible_to_cam,
+                            engine,
+                        )
                     if lux_shape:
                         mat = get_material(obj, mat_index, depsgraph)
                         if mat:
@@ -669,6 +848,14 @@ class ObjectCache2:
         if exported_stuff:
             scene_props.Set(props)
             self.exported_objects[obj_key] = exported_stuff
+            if not is_viewport_render:
+                self.instance_index[utils.get_instance_identity(dg_obj_instance)] = obj_key
+            self._add_instance_key(dg_obj_instance, obj_key)
+            if exporter.keep_scene:
+                self.frame_states[obj_key] = (
+                    dg_obj_instance.matrix_world.copy(),
+                    _get_geometry_fingerprint(obj),
+                )
 
         return exported_stuff
 
@@ -683,6 +870,7 @@ class ObjectCache2:
         scene_props,
         is_viewport_render,
         view_layer,
+        engine=None,
     ):
         transform = dg_obj_instance.matrix_world
 
@@ -694,7 +882,9 @@ class ObjectCache2:
             or (
                 exporter.motion_blur_enabled and obj.luxcore.enable_motion_blur
             )
-            or uses_displacement(obj)
+            or uses_displacement(obj, exporter.node_tree_flags)
+            # The transformation of objects in a reused scene must be editable
+            or exporter.keep_scene
         )
 
         mesh_key = self._get_mesh_key(obj, use_instancing, is_viewport_render)
@@ -703,16 +893,18 @@ class ObjectCache2:
             exported_mesh = self.exported_meshes[mesh_key]
             loaded_from_cache = True
         else:
-            exported_mesh = mesh_converter.convert(
-                obj,
-                mesh_key,
-                depsgraph,
-                luxcore_scene,
-                is_viewport_render,
-                use_instancing,
-                transform,
-                exporter,
-            )
+            with exporter.memory_phases.measure("meshes"):
+                exported_mesh = mesh_converter.convert(
+                    obj,
+                    mesh_key,
+                    depsgraph,
+                    luxcore_scene,
+                    is_viewport_render,
+                    use_instancing,
+                    transform,
+                    exporter,
+                    engine,
+                )
             self.exported_meshes[mesh_key] = exported_mesh
             loaded_from_cache = False
 
@@ -752,6 +944,132 @@ class ObjectCache2:
                 obj_id,
             )
 
+    def _add_instance_key(self, dg_obj_instance, obj_key):
+        pointers = [dg_obj_instance.object.original.as_pointer()]
+        if dg_obj_instance.is_instance:
+            pointers.append(dg_obj_instance.parent.original.as_pointer())
+        for pointer in pointers:
+            self.instance_keys_by_object.setdefault(pointer, set()).add(obj_key)
+
+    def update_frame(self, exporter, depsgraph, view_layer, luxcore_scene, scene_props, instances):
+        """
+        Apply the changes of a new animation frame to the objects exported in the previous
+        frames (see Exporter.update_frame()). Instead of depsgraph updates, the new frame is
+        compared against the exported data, only objects that moved or changed are updated.
+        Returns the instances that have to be duplicated again after the scene props were
+        parsed (duplicated objects can't be edited, see duplicate_instances()), or None if
+        the changes can't be applied to the scene because new objects are instanced.
+        """
+        seen_keys = set()
+        seen_duplis = set()
+        # Collect the dupli matrices of this frame to compare them with the exported ones
+        frame_duplis = {
+            pointer: Duplis(duplis.exported_obj, duplis.obj_id, duplis.count)
+            for pointer, duplis in instances.items()
+            if duplis
+        }
+        reexported_mesh_keys = set()
+
+        for dg_obj_instance in depsgraph.object_instances:
+            obj = dg_obj_instance.object
+
+            if dg_obj_instance.is_instance and obj.type in MESH_OBJECTS:
+                # Same distinction as in first_run(): the first instance is a normal object
+                pointer = obj.original.as_pointer()
+                if pointer in seen_duplis:
+                    # If there are no duplis, the object could not be exported (e.g. curve without faces)
+                    duplis = frame_duplis.get(pointer)
+                    if duplis:
+                        duplis.add(dg_obj_instance)
+                    continue
+                if pointer not in instances:
+                    # Newly instanced object
+                    return None
+                seen_duplis.add(pointer)
+            elif not utils.is_instance_visible(dg_obj_instance, obj, None):
+                continue
+
+            obj_key = utils.make_key_from_instance(dg_obj_instance)
+            seen_keys.add(obj_key)
+            exported_thing = self.exported_objects.get(obj_key)
+            old_state = self.frame_states.get(obj_key)
+
+            if isinstance(exported_thing, ExportedLight) and old_state:
+                transform_changed = old_state[0] != dg_obj_instance.matrix_world
+                if not transform_changed and not _light_may_change(obj, exporter.node_tree_flags):
+                    continue
+            elif isinstance(exported_thing, ExportedObject):
+                transform_changed = exported_thing.transform != dg_obj_instance.matrix_world
+                # Hair is exported with baked-in transformation
+                has_baked_transform = obj_key in self.exported_hair or any(
+                    psys.settings.type == "HAIR" for psys in obj.particle_systems
+                )
+                if obj.type == "MESH":
+                    fingerprint = _get_geometry_fingerprint(obj)
+                    geometry_changed = fingerprint is not None and (
+                        old_state is None or old_state[1] != fingerprint
+                    )
+                else:
+                    geometry_changed = _geometry_may_change(obj)
+
+                if geometry_changed or (transform_changed and has_baked_transform):
+                    mesh_key = self._get_mesh_key(obj, True, False)
+                    if mesh_key not in reexported_mesh_keys:
+                        self.exported_meshes.pop(mesh_key, None)
+                        reexported_mesh_keys.add(mesh_key)
+                    self.exported_hair.pop(obj_key, None)
+                    for psys in obj.particle_systems:
+                        for is_for_duplication in (True, False):
+                            self.exported_hair.pop(make_psys_key(obj, psys, is_for_duplication), None)
+                elif transform_changed:
+                    exported_thing.transform = dg_obj_instance.matrix_world.copy()
+                    scene_props.Set(exported_thing.get_props())
+                    if old_state:
+                        self.frame_states[obj_key] = (exported_thing.transform, old_state[1])
+                    continue
+                else:
+                    continue
+
+            # New objects, changed lights and objects with changed geometry are (re-)exported
+            self._convert_obj(
+                exporter,
+                dg_obj_instance,
+                obj,
+                depsgraph,
+                luxcore_scene,
+                scene_props,
+                False,
+                view_layer,
+            )
+
+        changed_instances = {}
+        for pointer, duplis in frame_duplis.items():
+            old_duplis = instances[pointer]
+            count = duplis.count
+            if count == old_duplis.count and np.array_equal(
+                duplis.matrices[:count], old_duplis.matrices[:count]
+            ):
+                continue
+            # Only the duplicates of this object are replaced
+            self._delete_duplicates(old_duplis, luxcore_scene)
+            instances[pointer] = duplis
+            changed_instances[pointer] = duplis
+
+        # Objects that disappeared in this frame
+        for obj_key in list(self.exported_objects.keys() - seen_keys):
+            self.exported_objects.pop(obj_key).delete(luxcore_scene)
+            self.frame_states.pop(obj_key, None)
+
+        return changed_instances
+
+    def _delete_duplicates(self, duplis, luxcore_scene):
+        """Delete the objects created by duplicate_instances() for these duplis"""
+        for part in duplis.exported_obj.parts:
+            # DuplicateObject() appends the index to the name prefix
+            dst_name = part.lux_obj + "dupli"
+            for i in range(duplis.get_count()):
+                luxcore_scene.DeleteObject(dst_name + str(i))
+
     def diff(self, depsgraph):
         only_scene = len(depsgraph.updates) == 1 and isinstance(
             depsgraph.updates[0].id, bpy.types.Scene
@@ -861,21 +1179,59 @@ class ObjectCache2:
                             self.exported_objects[obj_key] = exported_stuff
                             scene_props.Set(props)
 
-        # TODO maybe not loop over all instances, instead only loop over updated
-        #  objects and check if they have a particle system that needs to be updated?
-        #  Would be better for performance with many particles, however I'm not sure
-        #  we can find all instances corresponding to one particle system?
-
-        # Currently, every update that doesn't require a mesh re-export happens here
+        # Only look at instances whose object or parent (instancer) was updated.
+        # Depsgraph instances can't be accessed directly, so we still have to iterate
+        # them, but the expensive checks below are skipped for all other instances.
+        updated_objects = {}  # {original object pointer: original object}
+        for dg_update in depsgraph.updates:
+            if isinstance(dg_update.id, bpy.types.Object):
+                updated_objects[dg_update.id.original.as_pointer()] = dg_update.id.original
+
+        # New objects that became visible are not in depsgraph.updates
+        check_all = exporter.visibility_cache.has_new_objects
+        # Instancers can create new instances, we don't know how many
+        can_stop_early = not check_all and not any(
+            obj.is_instancer for obj in updated_objects.values()
+        )
+        # Exported instances and new objects that we still need to find
+        keys_left = {
+            key
+            for pointer in updated_objects
+            for key in self.instance_keys_by_object.get(pointer, ())
+            if key in self.exported_objects
+        }
+        new_objects_left = {
+            pointer
+            for pointer, obj in updated_objects.items()
+            if pointer not in self.instance_keys_by_object
+            and obj.type in EXPORTABLE_OBJECTS
+        }
+
+        # Every update that doesn't require a mesh re-export happens here
         for dg_obj_instance in depsgraph.object_instances:
+            if can_stop_early and not keys_left and not new_objects_left:
+                break
+
+            obj = dg_obj_instance.object
+
+            if not check_all:
+                pointer = obj.original.as_pointer()
+                if pointer not in updated_objects and not (
+                    dg_obj_instance.is_instance
+                    and dg_obj_instance.parent.original.as_pointer()
+                    in updated_objects
+                ):
+                    continue
+                new_objects_left.discard(pointer)
+
             if not supports_live_transform(dg_obj_instance.particle_system):
                 continue
 
-            obj = dg_obj_instance.object
             if not utils.is_instance_visible(dg_obj_instance, obj, context):
                 continue
 
             obj_key = utils.make_key_from_instance(dg_obj_instance)
+            keys_left.discard(obj_key)
             mesh_key = self._get_mesh_key(obj, use_instancing)
 
             if (
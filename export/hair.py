@@ -1,6 +1,8 @@
 from mathutils import Matrix
 import bpy
 import math
+from functools import partial
+from itertools import chain, product, repeat, starmap
 import numpy as np
 from .. import utils
 from ..utils import node as utils_node
@@ -9,6 +11,9 @@ from .image import ImageExporter
 from time import time
 from ..utils.errorlog import LuxCoreErrorLog
 
+# Number of strands collected per batch, export progress is reported after each batch
+HAIR_CHUNK_SIZE = 50000
+
 
 def find_psys_modifier(obj, psys):
     for mod in obj.modifiers:
@@ -49,32 +54,19 @@ def convert_uvs(
     if uv_index == -1 or not uv_textures[uv_index].data:
         return failure
 
-    if engine:
-        engine.update_stats(
-            "Exporting...",
-            "[%s: %s] Preparing %d UV coordinates"
-            % (obj.name, psys.name, strands_count),
-        )
-
-    first_particle = psys.particles[0]
-    f = psys.uv_on_emitter
-    uvs = np.fromiter(
-        (
-            elem
-            for i in range(start, dupli_count)
-            for elem in f(
-                mod,
-                particle=(
-                    psys.particles[i] if num_children == 0 else first_particle
-                ),
-                particle_no=i,
-                uv_no=uv_index,
-            )
-        ),
-        dtype=np.float32,
-        count=(dupli_count - start) * 2,
+    uv_on_emitter = partial(psys.uv_on_emitter, mod)
+    make_args = partial(
+        _make_emitter_args, psys.particles, num_children, uv_index
+    )
+    return _fill_in_chunks(
+        uv_on_emitter,
+        make_args,
+        start,
+        dupli_count,
+        2,
+        engine,
+        "[%s: %s] Preparing UV coordinates" % (obj.name, psys.name),
     )
-    return uvs
 
 
 def convert_colors(
@@ -112,30 +104,129 @@ def convert_colors(
     if vertex_color_index == -1 or not vertex_colors[vertex_color_index].data:
         return failure
 
-    if engine:
-        engine.update_stats(
-            "Exporting...",
-            "[%s: %s] Preparing %d vertex colors"
-            % (obj.name, psys.name, strands_count),
-        )
+    mcol_on_emitter = partial(psys.mcol_on_emitter, mod)
+    make_args = partial(
+        _make_emitter_args, psys.particles, num_children, vertex_color_index
+    )
+    return _fill_in_chunks(
+        mcol_on_emitter,
+        make_args,
+        start,
+        dupli_count,
+        3,
+        engine,
+        "[%s: %s] Preparing vertex colors" % (obj.name, psys.name),
+    )
+
+
+def _make_emitter_args(particles, num_children, layer_index, chunk_start, chunk_end):
+    """
+    Arguments (particle, particle_no, layer index) for uv_on_emitter()
+    and mcol_on_emitter(), for all strands in the chunk.
+    """
+    if num_children == 0:
+        chunk_particles = map(particles.__getitem__, range(chunk_start, chunk_end))
+    else:
+        chunk_particles = repeat(particles[0])
+    return zip(chunk_particles, range(chunk_start, chunk_end), repeat(layer_index))
+
 
-    first_particle = psys.particles[0]
-    f = psys.mcol_on_emitter
-    colors = np.fromiter(
-        (
-            elem
-            for i in range(start, dupli_count)
-            for elem in f(
-                mod,
-                psys.particles[i] if num_children == 0 else first_particle,
-                particle_no=i,
-                vcol_no=vertex_color_index,
+def _make_point_args(points_per_strand, chunk_start, chunk_end):
+    """Arguments (particle_no, step) for co_hair(), for all points in the chunk"""
+    return product(range(chunk_start, chunk_end), range(points_per_strand))
+
+
+def _fill_in_chunks(func, make_args, start, end, values_per_strand, engine, progress_msg):
+    """
+    Call func(*args) for every args tuple returned by make_args(chunk_start, chunk_end)
+    and write the flattened results into one preallocated buffer.
+    The loops run in C (itertools), and the progress is reported once per chunk.
+    Returns None if the export was cancelled.
+    """
+    strands_count = end - start
+    buffer = np.empty(strands_count * values_per_strand, dtype=np.float32)
+
+    for chunk_start in range(start, end, HAIR_CHUNK_SIZE):
+        chunk_end = min(chunk_start + HAIR_CHUNK_SIZE, end)
+        if engine:
+            engine.update_stats(
+                "Exporting...",
+                "%s (%d/%d strands)" % (progress_msg, chunk_start - start, strands_count),
             )
-        ),
-        dtype=np.float32,
-        count=(dupli_count - start) * 3,
-    )
-    return colors
+            if engine.test_break():
+                return None
+
+        offset = (chunk_start - start) * values_per_strand
+        count = (chunk_end - chunk_start) * values_per_strand
+        values = chain.from_iterable(starmap(func, make_args(chunk_start, chunk_end)))
+        buffer[offset:offset + count] = np.fromiter(values, dtype=np.float32, count=count)
+
+    return buffer
+
+
+def _make_check_args(check_steps, chunk_start, chunk_end):
+    """Arguments (particle_no, step) for co_hair(), for the checked steps of every strand in the chunk"""
+    return product(range(chunk_start, chunk_end), check_steps)
+
+
+def _path_matches_hair_keys(settings):
+    """
+    False if the path cache can differ from the hair keys between the tips:
+    B-spline interpolation does not pass through the keys, roughness and
+    force fields move the points (dynamics and textures are checked separately)
+    """
+    if settings.use_hair_bspline:
+        return False
+    if settings.roughness_1 or settings.roughness_2 or settings.roughness_endpoint:
+        return False
+    if settings.effector_weights.all and any(
+        obj.field and obj.field.type != "NONE" for obj in bpy.data.objects
+    ):
+        return False
+    return True
+
+
+def _convert_points_bulk(obj, psys, points_per_strand):
+    """
+    Read the hair keys of all particles with foreach_get (one call per strand
+    instead of one co_hair() call per point, hair keys can only be accessed
+    per particle).
+    This is only possible if the hair has no children and the path cache
+    contains exactly the hair keys, i.e. every strand has as many hair keys
+    as render steps. Returns None if this is not the case.
+    """
+    # Dynamics and textures (e.g. influencing the length) change the path
+    # cache per strand, the hair keys are not affected
+    if psys.use_hair_dynamics or any(psys.settings.texture_slots):
+        return None
+    if not _path_matches_hair_keys(psys.settings):
+        return None
+
+    particles = psys.particles
+    strands_count = len(particles)
+    keys = np.empty((strands_count, points_per_strand, 3), dtype=np.float32)
+    for particle, strand_keys in zip(particles, keys):
+        if len(particle.hair_keys) != points_per_strand:
+            # E.g. strands subdivided in particle edit mode
+            return None
+        particle.hair_keys.foreach_get("co", strand_keys.ravel())
+
+    # Hair keys are in object space, co_hair() returns world space coordinates
+    matrix = np.array(obj.matrix_world, dtype=np.float32)
+    points = keys.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+    points = points.reshape(strands_count, points_per_strand, 3)
+
+    # Make sure the keys match the path cache of every strand, comparing the
+    # middle and the tip of all strands at once (the root never moves)
+    check_steps = (points_per_strand // 2, points_per_strand - 1)
+    co_hair = partial(psys.co_hair, obj)
+    make_args = partial(_make_check_args, check_steps)
+    expected = _fill_in_chunks(co_hair, make_args, 0, strands_count, 3 * len(check_steps), None, "")
+    expected = expected.reshape(strands_count, len(check_steps), 3)
+    if not np.allclose(points[:, check_steps], expected, rtol=1e-4, atol=1e-5):
+        return None
+
+    return points.ravel()
 
 
 def warn_about_missing_uvs(obj, node_tree):
@@ -219,17 +310,25 @@ def convert_hair(
                 "[%s: %s] Preparing %d points"
                 % (obj.name, psys.name, point_count),
             )
-        co_hair = psys.co_hair
-        points = np.fromiter(
-            (
-                elem
-                for pindex in range(start, dupli_count)
-                for step in range(points_per_strand)
-                for elem in co_hair(object=obj, particle_no=pindex, step=step)
-            ),
-            dtype=np.float32,
-            count=point_count * 3,
-        )
+        points = None
+        if num_children == 0:
+            points = _convert_points_bulk(obj, psys, points_per_strand)
+
+        if points is None:
+            co_hair = partial(psys.co_hair, obj)
+            make_args = partial(_make_point_args, points_per_strand)
+            points = _fill_in_chunks(
+                co_hair,
+                make_args,
+                start,
+                dupli_count,
+                points_per_strand * 3,
+                engine,
+                "[%s: %s] Preparing points" % (obj.name, psys.name),
+            )
+            if points is None:
+                # Export cancelled by user
+                return None
 
         colors = np.empty(shape=0, dtype=np.float32)
         uvs = np.empty(shape=0, dtype=np.float32)
@@ -285,6 +384,10 @@ def convert_hair(
 
             obj.to_mesh_clear()
 
+            if colors is None or uvs is None:
+                # Export cancelled by user
+                return None
+
         if len(uvs) == 0:
             copy_uvs = False
 
@@ -310,29 +413,30 @@ def convert_hair(
         else:
             transformation = None
 
-        success = luxcore_scene.DefineBlenderStrands(
-            lux_shape_name,
-            points_per_strand,
-            points,
-            colors,
-            uvs,
-            image_filename,
-            settings.gamma,
-            copy_uvs,
-            transformation,
-            strand_diameter,
-            root_width,
-            tip_width,
-            width_offset,
-            settings.tesseltype,
-            settings.adaptive_maxdepth,
-            settings.adaptive_error,
-            settings.solid_sidecount,
-            settings.solid_capbottom,
-            settings.solid_captop,
-            list(settings.root_color),
-            list(settings.tip_color),
-        )
+        with exporter.lock_scene():
+            success = luxcore_scene.DefineBlenderStrands(
+                lux_shape_name,
+                points_per_strand,
+                points,
+                colors,
+                uvs,
+                image_filename,
+                settings.gamma,
+                copy_uvs,
+                transformation,
+                strand_diameter,
+                root_width,
+                tip_width,
+                width_offset,
+                settings.tesseltype,
+                settings.adaptive_maxdepth,
+                settings.adaptive_error,
+                settings.solid_sidecount,
+                settings.solid_capbottom,
+                settings.solid_captop,
+                list(settings.root_color),
+                list(settings.tip_color),
+            )
 
         # Sometimes no hair shape could be created, e.g. if the length
         # of all hairs is 0 (can happen e.g. during animations or if hair
@@ -402,11 +506,44 @@ def get_hair_material_index(psys):
     return psys.settings.material - 1
 
 
-def get_strand_seg(idx, strand):
-    if idx >= len(strand.points):
-        return [0.0, 0.0, 0.0]
-    else:
-        return strand.points[idx].position
+def get_curves_attribute(curves, name, prop, width):
+    """
+    Read a Hair Curves attribute with one foreach_get call.
+    Returns an array of shape (count, width), or None if the attribute does not exist.
+    """
+    attribute = curves.attributes.get(name)
+    if attribute is None:
+        return None
+    values = np.empty(len(attribute.data) * width, dtype=np.float32)
+    attribute.data.foreach_get(prop, values)
+    return values.reshape(-1, width)
+
+
+def find_curves_color_attribute(curves, settings):
+    if settings.use_active_vertex_color_layer:
+        active_color = curves.attributes.active_color
+        if active_color:
+            return active_color.name
+        # No active color attribute, use the first one
+        for attribute in curves.attributes:
+            if attribute.data_type in {"FLOAT_COLOR", "BYTE_COLOR"} and not attribute.is_internal:
+                return attribute.name
+        return None
+    return settings.vertex_color_layer_name
+
+
+def convert_curves_radius(radius, offsets):
+    """
+    LuxCore only supports one thickness profile for all strands, so the
+    per-point radius is mapped to the average root and tip radius.
+    Returns (strand_diameter, root_width, tip_width)
+    """
+    root_radius = float(np.mean(radius[offsets[:-1]]))
+    tip_radius = float(np.mean(radius[offsets[1:] - 1]))
+    max_radius = max(root_radius, tip_radius)
+    if max_radius <= 0:
+        return None
+    return 2 * max_radius, root_radius / max_radius, tip_radius / max_radius
 
 
 # Code for Hair Curves in Blender 3.5
@@ -415,24 +552,16 @@ def convert_hair_curves(
 ):
     start_time = time()
     lux_shape_name = obj_key
-    time_elapsed = time() - start_time
     scene = depsgraph.scene_eval
 
-    strands = obj.data.curves
-
-    points_per_strand = np.fromiter(
-        (strand.points_length for strand in strands), dtype=np.int32
-    )
+    curves = obj.data
+    # Read all point positions and the strand offsets in O(1) Python calls
+    offsets = np.empty(len(curves.curve_offset_data), dtype=np.int32)
+    curves.curve_offset_data.foreach_get("value", offsets)
+    points_per_strand = np.diff(offsets).astype(np.int32)
 
-    points = np.fromiter(
-        (
-            elem
-            for strand in strands
-            for idx in range(strand.points_length)
-            for elem in strand.points[idx].position
-        ),
-        dtype=np.float32,
-    )
+    points = np.empty(len(curves.points) * 3, dtype=np.float32)
+    curves.points.foreach_get("position", points)
 
     colors = np.empty(shape=0, dtype=np.float32)
     uvs = np.empty(shape=0, dtype=np.float32)
@@ -443,6 +572,13 @@ def convert_hair_curves(
     tip_width = settings.tip_width / 100
     width_offset = settings.width_offset / 100
 
+    if settings.use_radius_attribute and len(points_per_strand):
+        radius = get_curves_attribute(curves, "radius", "value", 1)
+        if radius is not None:
+            thickness = convert_curves_radius(radius.ravel(), offsets)
+            if thickness:
+                strand_diameter, root_width, tip_width = thickness
+
     export_color = settings.export_color
     image = settings.image
     image_filename = ""
@@ -450,9 +586,6 @@ def convert_hair_curves(
     copy_uvs = settings.copy_uv_coords
 
     if export_color != "none" or uvs_needed:
-        emitter_mesh = obj.parent.to_mesh(depsgraph=depsgraph)
-        vertex_colors = emitter_mesh.vertex_colors
-
         if export_color == "uv_texture_map" and image:
             try:
                 image_filename = ImageExporter.export(
@@ -466,53 +599,61 @@ def convert_hair_curves(
                     obj.data.name,
                 )
                 LuxCoreErrorLog.add_warning(msg, obj_name=obj.name)
-        #     elif settings.export_color == "vertex_color":
-        #         colors = convert_colors(obj, psys, settings, vertex_colors, engine,
-        #                                 strands_count, start, dupli_count, mod, num_children)
+        elif export_color == "vertex_color":
+            color_name = find_curves_color_attribute(curves, settings)
+            strand_colors = None
+            if color_name:
+                strand_colors = get_curves_attribute(curves, color_name, "color", 4)
+
+            if strand_colors is None:
+                LuxCoreErrorLog.add_warning(
+                    "No color attribute found on hair curves", obj_name=obj.name
+                )
+            else:
+                if len(strand_colors) != len(points_per_strand):
+                    # Point domain, use the color at the root of each strand
+                    strand_colors = strand_colors[offsets[:-1]]
+                colors = np.ascontiguousarray(strand_colors[:, :3]).ravel()
 
         if uvs_needed:
-            uvs = np.fromiter(
-                (
-                    elem
-                    for uv_coord in obj.data.attributes[
-                        "surface_uv_coordinate"
-                    ].data
-                    for elem in uv_coord.vector
-                ),
-                dtype=np.float32,
+            surface_uvs = get_curves_attribute(
+                curves, "surface_uv_coordinate", "vector", 2
             )
+            if surface_uvs is not None:
+                uvs = surface_uvs.ravel()
 
     if len(uvs) == 0:
         copy_uvs = False
 
     transformation = None
-    success = luxcore_scene.DefineBlenderCurveStrands(
-        lux_shape_name,
-        points_per_strand,
-        points,
-        colors,
-        uvs,
-        image_filename,
-        settings.gamma,
-        copy_uvs,
-        transformation,
-        strand_diameter,
-        root_width,
-        tip_width,
-        width_offset,
-        settings.tesseltype,
-        settings.adaptive_maxdepth,
-        settings.adaptive_error,
-        settings.solid_sidecount,
-        settings.solid_capbottom,
-        settings.solid_captop,
-        list(settings.root_color),
-        list(settings.tip_color),
-    )
+    with exporter.lock_scene():
+        success = luxcore_scene.DefineBlenderCurveStrands(
+            lux_shape_name,
+            points_per_strand,
+            points,
+            colors,
+            uvs,
+            image_filename,
+            settings.gamma,
+            copy_uvs,
+            transformation,
+            strand_diameter,
+            root_width,
+            tip_width,
+            width_offset,
+            settings.tesseltype,
+            settings.adaptive_maxdepth,
+            settings.adaptive_error,
+            settings.solid_sidecount,
+            settings.solid_capbottom,
+            settings.solid_captop,
+            list(settings.root_color),
+            list(settings.tip_color),
+        )
 
     if not success:
         return None
 
     if exporter.stats:
-        exporter.stats.export_time_hair.value += time_elapsed
+        exporter.stats.export_time_hair.value += time() - start_time
     return lux_shape_name
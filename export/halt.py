@@ -5,6 +5,14 @@ SMALLEST_NOISE_THRESH = 0.0001
 
 
 def convert(scene):
+    return utils.luxutils.create_props(*convert_definitions(scene))
+
+
+def convert_definitions(scene):
+    """
+    Returns the prefix and the definitions of convert(), without creating the
+    Properties (see DigestCache.diff_definitions())
+    """
     prefix = ""
     definitions = {}
 
@@ -50,4 +58,4 @@ def convert(scene):
     definitions["batch.haltspp"] = [halt_spp_eye, halt_spp_light]
     definitions["batch.halttime"] = halt_time
 
-    return utils.luxutils.create_props(prefix, definitions)
+    return prefix, definitions
@@ -1,49 +1,263 @@
 import bpy
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import hashlib
 import tempfile
 import os
+from time import time
 from .. import utils
+from ..utils.disk_cache import DiskCache
+
+# Increment when the layout of the cache entries or the key computation changes
+CACHE_VERSION = 1
+# Name of the image file inside a cache entry, the extension is appended
+IMAGE_FILENAME = "image"
+WRITE_THREADS = min(8, os.cpu_count() or 1)
+# Packed data copied from Blender but not written yet, limits the memory usage
+MAX_PENDING_BYTES = 1024**3
+
+
+def _get_extension(image):
+    if image.filepath_raw:
+        _, extension = os.path.splitext(image.filepath_raw)
+        return extension
+    # Generated images do not have a filepath, fallback to file_format
+    return "." + image.file_format.lower()
+
+
+def _get_packed_key(data, extension):
+    digest = hashlib.blake2b(data, digest_size=20)
+    digest.update(f"{CACHE_VERSION}{extension}".encode())
+    return digest.hexdigest()
+
+
+def _get_packed_token(packed_file):
+    """
+    Cheap fingerprint of packed data, to find out if an image was repacked
+    without reading its data. Repacking creates a new PackedFile. In case the
+    new one re-uses the memory address of the old one, the keys are also
+    forgotten when the depsgraph reports edited images (see forget_packed_keys()).
+    """
+    return packed_file.as_pointer(), packed_file.size
+
+
+def _get_generated_key(image, extension):
+    # Generated images that were not painted on are fully described by their settings
+    settings = (
+        CACHE_VERSION,
+        extension,
+        image.generated_type,
+        image.generated_width,
+        image.generated_height,
+        tuple(image.generated_color),
+        image.use_generated_float,
+        image.file_format,
+        image.colorspace_settings.name,
+        image.alpha_mode,
+    )
+    return hashlib.blake2b(repr(settings).encode(), digest_size=20).hexdigest()
+
+
+def _can_write_packed(image):
+    # Painted images have to be saved, the packed data is outdated
+    return image.source == "FILE" and image.packed_file and not image.is_dirty
+
+
+def _save_image(image, filepath):
+    orig_filepath = image.filepath_raw
+    orig_source = image.source
+    image.filepath_raw = filepath
+
+    try:
+        image.save()
+    except RuntimeError as error:
+        raise OSError(str(error))
+    finally:
+        # The changes above altered the source to "FILE", so we have to restore the original source
+        image.filepath_raw = orig_filepath
+        image.source = orig_source
+
+
+def _write_packed(disk_cache, key, data, extension):
+    """Write packed image data into a new cache entry, returns the entry path"""
+    temp_path = disk_cache.begin_write(key)
+    try:
+        with open(os.path.join(temp_path, IMAGE_FILENAME + extension), "wb") as image_file:
+            image_file.write(data)
+    except OSError:
+        disk_cache.abort(temp_path)
+        raise
+    return disk_cache.commit(key, temp_path)
+
+
+def _cache_packed(disk_cache, data, extension):
+    """Runs in a worker thread, returns (key, True if the entry was written)"""
+    key = _get_packed_key(data, extension)
+    if disk_cache.get(key) is not None:
+        return key, False
+    _write_packed(disk_cache, key, data, extension)
+    return key, True
 
 
 class ImageExporter(object):
     """
     This class is a singleton
+
+    Packed and generated images are stored in a persistent disk cache, keyed by
+    a hash of the packed data or of the generation settings, so they are only
+    written once across renders and Blender sessions. Painted images that were
+    not saved are written to temporary files instead.
     """
+    # Temporary files of painted images, deleted in cleanup()
     temp_images = {}
+    # Maps the session key of a packed image to (_get_packed_token(), cache key),
+    # so the packed data is only hashed once per session
+    packed_keys = {}
+    disk_cache = None
 
-    @classmethod
-    def _save_to_temp_file(cls, image):
+    @staticmethod
+    def _get_session_key(image):
         # Note: We can't use utils.make_key(image) here because the memory address
         # might be re-used on undo, causing a key collision
         if image.filepath_raw:
-            key = image.filepath_raw
-        else:
-            key = image.name
+            return image.filepath_raw
+        return image.name
+
+    @classmethod
+    def _get_disk_cache(cls):
+        preferences = utils.get_addon_preferences(bpy.context)
+        root = preferences.get_cache_dir("images")
+        max_size = preferences.image_cache_max_size * 1024**3
+
+        if cls.disk_cache is None or cls.disk_cache.root != root:
+            cls.disk_cache = DiskCache(root, max_size)
+        cls.disk_cache.max_size = max_size
+        return cls.disk_cache
+
+    @classmethod
+    def _get_cached_packed_key(cls, image, token):
+        cached = cls.packed_keys.get(cls._get_session_key(image))
+        if cached and cached[0] == token:
+            return cached[1]
+        return None
+
+    @classmethod
+    def forget_packed_keys(cls):
+        """Called when images were edited, they might have been repacked or reloaded"""
+        cls.packed_keys.clear()
+
+    @classmethod
+    def cache_packed_images(cls, images):
+        """
+        Write the packed images that are not in the disk cache yet, in parallel.
+        Called at the start of an export with the images used by the scene, so
+        export() only has to look them up.
+        Returns (number of cached packed images, number of written images).
+        """
+        disk_cache = cls._get_disk_cache()
+        futures = {}
+        pending = set()
+        pending_bytes = 0
+        written_count = 0
+
+        def _collect(done):
+            nonlocal pending_bytes, written_count
+            for future in done:
+                session_key, size, token = futures.pop(future)
+                pending_bytes -= size
+                try:
+                    key, written = future.result()
+                except OSError as error:
+                    # export() tries again and reports the error
+                    print(f'[Image Cache] Could not write image "{session_key}": {error}')
+                    continue
+                cls.packed_keys[session_key] = (token, key)
+                written_count += written
+
+        image_count = 0
+        with ThreadPoolExecutor(WRITE_THREADS) as executor:
+            for image in images:
+                if not _can_write_packed(image):
+                    continue
+                image_count += 1
+                packed_file = image.packed_file
+                token = _get_packed_token(packed_file)
+                key = cls._get_cached_packed_key(image, token)
+                if key and disk_cache.get(key) is not None:
+                    continue
+
+                while pending and pending_bytes >= MAX_PENDING_BYTES:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+
+                size = packed_file.size
+                future = executor.submit(_cache_packed, disk_cache, packed_file.data, _get_extension(image))
+                futures[future] = (cls._get_session_key(image), size, token)
+                pending.add(future)
+                pending_bytes += size
+
+            _collect(wait(pending).done)
+        return image_count, written_count
+
+    @classmethod
+    def _export_packed(cls, image):
+        disk_cache = cls._get_disk_cache()
+        extension = _get_extension(image)
+        packed_file = image.packed_file
+        token = _get_packed_token(packed_file)
+        key = cls._get_cached_packed_key(image, token)
+        path = disk_cache.get(key) if key else None
+
+        if path is None:
+            # Only read the packed data if the image is not in the cache
+            data = packed_file.data
+            key = _get_packed_key(data, extension)
+            path = disk_cache.get(key)
+            if path is None:
+                # Not prepared by cache_packed_images() or evicted in the meantime
+                print('Writing packed image "%s" to the image cache' % image.name)
+                path = _write_packed(disk_cache, key, data, extension)
+
+        cls.packed_keys[cls._get_session_key(image)] = (token, key)
+        return os.path.join(path, IMAGE_FILENAME + extension)
+
+    @classmethod
+    def _export_generated(cls, image):
+        disk_cache = cls._get_disk_cache()
+        extension = _get_extension(image)
+        key = _get_generated_key(image, extension)
+
+        path = disk_cache.get(key)
+        if path is None:
+            print('Saving generated image "%s" to the image cache' % image.name)
+            temp_path = disk_cache.begin_write(key)
+            try:
+                _save_image(image, os.path.join(temp_path, IMAGE_FILENAME + extension))
+            except OSError:
+                disk_cache.abort(temp_path)
+                raise
+            path = disk_cache.commit(key, temp_path)
+        return os.path.join(path, IMAGE_FILENAME + extension)
+
+    @classmethod
+    def _save_to_temp_file(cls, image):
+        # Painted images can change at any time, they would only fill up the cache
+        if not image.is_dirty:
+            if image.source == "GENERATED":
+                return cls._export_generated(image)
+            if _can_write_packed(image):
+                return cls._export_packed(image)
+
+        key = cls._get_session_key(image)
 
         if key in cls.temp_images:
             # Image was already exported
             temp_image = cls.temp_images[key]
         else:
-            if image.filepath_raw:
-                _, extension = os.path.splitext(image.filepath_raw)
-            else:
-                # Generated images do not have a filepath, fallback to file_format
-                extension = "." + image.file_format.lower()
-
+            extension = _get_extension(image)
             temp_image = tempfile.NamedTemporaryFile(delete=False, suffix=extension)
 
             print('Unpacking image "%s" to temp file "%s"' % (image.name, temp_image.name))
-            orig_filepath = image.filepath_raw
-            orig_source = image.source
-            image.filepath_raw = temp_image.name
-
-            try:
-                image.save()
-            except RuntimeError as error:
-                raise OSError(str(error))
-            finally:
-                # The changes above altered the source to "FILE", so we have to restore the original source
-                image.filepath_raw = orig_filepath
-                image.source = orig_source
+            _save_image(image, temp_image.name)
 
             # Only store the key once we are sure that everything went OK
             cls.temp_images[key] = temp_image
@@ -113,4 +327,12 @@ class ImageExporter(object):
             os.remove(filepath)
 
         cls.temp_images.clear()
+        cls.packed_keys.clear()
+
+    @classmethod
+    def evict(cls):
+        """Delete the least recently used cache entries if the cache is too large"""
+        if cls.disk_cache is None:
+            return 0
+        return cls.disk_cache.evict()
 
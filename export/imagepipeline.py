@@ -1,11 +1,18 @@
 from collections import OrderedDict
-import pyluxcore
 from .. import utils
 from .image import ImageExporter
 from ..utils.errorlog import LuxCoreErrorLog
 
 
 def convert(scene, context=None, index=0):
+    return utils.luxutils.create_props(*convert_definitions(scene, context, index))
+
+
+def convert_definitions(scene, context=None, index=0):
+    """
+    Returns the prefix and the definitions of convert(), without creating the
+    Properties (see DigestCache.diff_definitions())
+    """
     try:
         prefix = "film.imagepipelines.%03d." % index
         definitions = OrderedDict()
@@ -13,25 +20,25 @@ def convert(scene, context=None, index=0):
         if utils.in_material_shading_mode(context):
             index = _output_switcher(definitions, 0, "ALBEDO")
             _exposure_compensated_tonemapper(definitions, index, scene)
-            return utils.luxutils.create_props(prefix, definitions)
+            return prefix, definitions
 
         if utils.using_photongi_debug_mode(context, scene):
             _exposure_compensated_tonemapper(definitions, 0, scene)
-            return utils.luxutils.create_props(prefix, definitions)
+            return prefix, definitions
 
         if not utils.is_valid_camera(scene.camera):
             # Can not work without a camera
             _fallback(definitions)
-            return utils.luxutils.create_props(prefix, definitions)
+            return prefix, definitions
 
         convert_defs(context, scene, definitions, 0)
 
-        return utils.luxutils.create_props(prefix, definitions)
+        return prefix, definitions
     except Exception as error:
         import traceback
         traceback.print_exc()
         LuxCoreErrorLog.add_warning('Imagepipeline: %s' % error)
-        return pyluxcore.Properties()
+        return "", {}
 
 
 def convert_defs(context, scene, definitions, plugin_index, define_radiancescales=True):
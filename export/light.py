@@ -20,10 +20,11 @@ def convert_light(exporter, obj, obj_key, depsgraph, luxcore_scene, transform, i
         luxcore_name = obj_key
         scene = depsgraph.scene_eval
 
-        # If this light was previously defined as an area lamp, delete the area lamp mesh
-        luxcore_scene.DeleteObject(_get_area_obj_name(luxcore_name))
-        # If this light was previously defined as a light, delete it
-        luxcore_scene.DeleteLight(luxcore_name)
+        with exporter.lock_scene():
+            # If this light was previously defined as an area lamp, delete the area lamp mesh
+            luxcore_scene.DeleteObject(_get_area_obj_name(luxcore_name))
+            # If this light was previously defined as a light, delete it
+            luxcore_scene.DeleteLight(luxcore_name)
 
         prefix = "scene.lights." + luxcore_name + "."
 
@@ -156,8 +157,9 @@ def _convert_cycles_light(exporter, obj, depsgraph, luxcore_scene, transform, is
         # Object
         use_instancing = utils.use_instancing(obj, scene, is_viewport_render)
         visible_to_camera = False
-        obj_props, exported_obj = _create_luxcore_meshlight(obj, transform, use_instancing, luxcore_name,
-                                                            luxcore_scene, mat_name, visible_to_camera)
+        with exporter.lock_scene():
+            obj_props, exported_obj = _create_luxcore_meshlight(obj, transform, use_instancing, luxcore_name,
+                                                                luxcore_scene, mat_name, visible_to_camera)
         props.Set(obj_props)
         return props, exported_obj
     else:
@@ -822,8 +824,9 @@ def _convert_area_light(obj, scene, is_viewport_render, exporter, depsgraph, lux
     # LuxCore object
     use_instancing = utils.use_instancing(obj, scene, is_viewport_render)
     visible_to_camera = obj.luxcore.visible_to_camera and light.luxcore.visible
-    obj_props, exported_obj = _create_luxcore_meshlight(obj, transform, use_instancing, luxcore_name,
-                                                        luxcore_scene, mat_name, visible_to_camera)
+    with exporter.lock_scene():
+        obj_props, exported_obj = _create_luxcore_meshlight(obj, transform, use_instancing, luxcore_name,
+                                                            luxcore_scene, mat_name, visible_to_camera)
     props.Set(obj_props)
     return props, exported_obj
 
@@ -1,4 +1,8 @@
-from contextlib import contextmanager
+from concurrent import futures
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import os
+import threading
 from time import time
 import numpy as np
 
@@ -16,6 +20,11 @@ if _needs_reload:
     importlib.reload(caches)
     importlib.reload(utils)
 
+# Meshes with more triangles are converted in chunks, with progress reports
+MESH_CHUNK_THRESHOLD = 2000000
+# Number of triangles or loops processed per chunk
+MESH_CHUNK_SIZE = 500000
+
 # https://blenderartists.org/t/\
 # efficient-copying-of-vertex-coords-to-and-from-numpy-arrays/661467/2
 def get_ndarray(
@@ -40,85 +49,386 @@ def convert(
     use_instancing,
     transform,
     exporter=None,
+    engine=None,
 ):
     start_time = time()
+    mesh_cache = exporter.mesh_cache if exporter else None
+    mesh_pool = exporter.mesh_pool if exporter else None
+    partition = depsgraph.scene_eval.luxcore.config.export.partition_meshes
 
     with _prepare_mesh(obj, depsgraph) as mesh:
         if mesh is None:
             return None
 
-        # Loop vertices
-        loop_vertex_indices = get_ndarray(
-            mesh.loops, "vertex_index", 1, np.uint32
-        ).ravel()
-        vertices = get_ndarray(mesh.vertices, "co", 3, np.float32)
-        loop_vertices = vertices[loop_vertex_indices]
+        parts = None
+        mesh_data = None
+        cache_key = None
+        if mesh_cache:
+            cache_key = caches.mesh_cache.make_key(obj, mesh, partition)
+            parts = mesh_cache.load(cache_key)
 
-        # Loop triangles
-        loop_triangles = get_ndarray(
-            mesh.loop_triangles, "loops", 3, np.uint32
+        if parts is None:
+            mesh.split_faces()  # Applies smooth by angle operator
+            # Only the data is read from Blender here, the processing is done in
+            # _define_meshes(), possibly on a worker thread
+            mesh_data = _read_mesh(mesh)
+            used_mats = np.flatnonzero(mesh_data["mat_counts"])
+        else:
+            used_mats = [mat for mat, _ in parts]
+
+    if mesh_data is not None and len(mesh_data["loop_triangles"]) > MESH_CHUNK_THRESHOLD:
+        # Huge meshes are processed on the main thread, so the progress can be
+        # reported and the conversion can be cancelled
+        parts = _build_parts_chunked(
+            mesh_data, partition, _get_progress_callback(engine, obj.name)
         )
+        mesh_data = None
+        if parts is None:
+            # Export was cancelled by user
+            return None
+        if mesh_cache:
+            mesh_cache.save(cache_key, parts)
 
-        # Material slot index for each triangle
-        loop_triangle_materials = get_ndarray(
-            mesh.loop_triangles, "material_index", 1, np.uint32
-        ).ravel()
-        unique_mats = np.unique(loop_triangle_materials)
+    # Transformation
+    if is_viewport_render or use_instancing:
+        mesh_transform = None
+    else:
+        mesh_transform = np.array(
+            [
+                transform[0][0:4],
+                transform[1][0:4],
+                transform[2][0:4],
+                transform[3][0:4],
+            ],
+            dtype=np.float32,
+        )
 
-        # Normals
-        loop_normals = get_ndarray(mesh.loops, "normal", 3, np.float32)
+    # The names are known before the meshes are defined, so the rest of the
+    # export can already reference them
+    mesh_definitions = [(f"{str(mesh_key)}{mat:03d}", int(mat)) for mat in used_mats]
 
-        # UV
-        uvs = [
-            get_ndarray(uv_layer.uv, "vector", 2, np.float32)
-            for uv_layer in mesh.uv_layers
-        ]
+    # The caller replaces the entries of mesh_definitions with the shape names,
+    # so the job gets its own list of mesh names
+    names = [name for name, _ in mesh_definitions]
 
-        # Colors
-        rgba_colors = [
-            get_ndarray(color_attribute.data, "color_srgb", 4, np.float32)
-            for color_attribute in mesh.color_attributes
-        ]
-        rgb_colors = [rgba[:, :3] for rgba in rgba_colors]
-        alphas = [rgba[:, 3] for rgba in rgba_colors]
-        loop_rgb_colors = [col[loop_vertex_indices] for col in rgb_colors]
-        loop_alphas = [alpha[loop_vertex_indices] for alpha in alphas]
-
-        # Transformation
-        if is_viewport_render or use_instancing:
-            mesh_transform = None
-        else:
-            mesh_transform = np.array(
-                [
-                    transform[0][0:4],
-                    transform[1][0:4],
-                    transform[2][0:4],
-                    transform[3][0:4],
-                ],
-                dtype=np.float32,
-            )
+    if mesh_pool:
+        mesh_pool.submit(
+            _define_meshes, luxcore_scene, names, mesh_transform,
+            parts, mesh_data, partition, mesh_cache, cache_key, mesh_pool.define_lock,
+        )
+    else:
+        _define_meshes(
+            luxcore_scene, names, mesh_transform,
+            parts, mesh_data, partition, mesh_cache, cache_key, nullcontext(),
+        )
+
+    if exporter and exporter.stats:
+        exporter.stats.export_time_meshes.value += time() - start_time
+
+    return caches.exported_data.ExportedMesh(mesh_definitions)
+
+
+class MeshWorkerPool:
+    """
+    Runs the NumPy processing of the meshes and DefineMeshExt() on worker threads,
+    while the main thread reads the next meshes from Blender.
+    Only used during the first export of a final render. All jobs have to be
+    finished with wait() before the LuxCore scene is parsed.
+    """
+
+    def __init__(self, thread_count):
+        self.executor = ThreadPoolExecutor(max_workers=thread_count, thread_name_prefix="LuxCoreMesh")
+        # Each pending job holds a copy of the mesh data, so the main thread
+        # has to wait when it reads the meshes faster than they are processed
+        self.max_pending = thread_count * 2
+        self.pending = set()
+        # The LuxCore scene is not thread-safe, the main thread takes this
+        # lock too when it changes the scene (see Exporter.lock_scene())
+        self.define_lock = threading.Lock()
+
+    def submit(self, func, *args):
+        if len(self.pending) >= self.max_pending:
+            done, self.pending = futures.wait(self.pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                # Re-raises exceptions from the worker thread
+                future.result()
+        self.pending.add(self.executor.submit(func, *args))
+
+    def wait(self):
+        try:
+            for future in futures.as_completed(self.pending):
+                future.result()
+        finally:
+            self.pending.clear()
+
+    def shutdown(self, cancel=False):
+        self.executor.shutdown(wait=True, cancel_futures=cancel)
+        self.pending.clear()
 
-        mesh_definitions = []
-        for mat in unique_mats:
-            mat_triangles = loop_triangles[loop_triangle_materials == mat]
-            name = f"{str(mesh_key)}{mat:03d}"
 
+def get_thread_count(export_settings):
+    """The number of mesh worker threads, 1 means no worker threads are used"""
+    return export_settings.mesh_threads or os.cpu_count() or 1
+
+
+def _define_meshes(luxcore_scene, names, mesh_transform, parts,
+                   mesh_data, partition, mesh_cache, cache_key, define_lock):
+    if parts is None:
+        parts = _build_parts(mesh_data, partition)
+        if mesh_cache:
+            mesh_cache.save(cache_key, parts)
+
+    for name, (_, arrays) in zip(names, parts):
+        with define_lock:
             luxcore_scene.DefineMeshExt(
                 name=name,
-                points=loop_vertices,
-                triangles=mat_triangles,
-                normals=loop_normals,
-                uvs=uvs,
-                colors=loop_rgb_colors,
-                alphas=loop_alphas,
                 transformation=mesh_transform,
+                **arrays,
+            )
+
+
+def _read_mesh(mesh):
+    """
+    Read the mesh data from Blender. Must run on the main thread.
+    Returns a dict of arrays that is turned into parts by _build_parts().
+    """
+    # Material slot index for each triangle
+    loop_triangle_materials = get_ndarray(
+        mesh.loop_triangles, "material_index", 1, np.uint32
+    ).ravel()
+
+    return {
+        "loop_vertex_indices": get_ndarray(
+            mesh.loops, "vertex_index", 1, np.uint32
+        ).ravel(),
+        "vertices": get_ndarray(mesh.vertices, "co", 3, np.float32),
+        "loop_triangles": get_ndarray(mesh.loop_triangles, "loops", 3, np.uint32),
+        "loop_triangle_materials": loop_triangle_materials,
+        "mat_counts": np.bincount(loop_triangle_materials),
+        "loop_normals": get_ndarray(mesh.loops, "normal", 3, np.float32),
+        "uvs": [
+            get_ndarray(uv_layer.uv, "vector", 2, np.float32)
+            for uv_layer in mesh.uv_layers
+        ],
+        "rgba_colors": [
+            get_ndarray(color_attribute.data, "color_srgb", 4, np.float32)
+            for color_attribute in mesh.color_attributes
+        ],
+    }
+
+
+def _build_parts(mesh_data, partition=False):
+    """
+    Process the arrays returned by _read_mesh(). Does not access Blender data,
+    so it can run on a worker thread.
+    Returns a list of (material index, arrays) tuples, where arrays is a
+    dict with the keyword arguments for DefineMeshExt().
+
+    If partition is True, the vertex streams of each part are compacted to
+    the loops referenced by its triangles, otherwise all parts share the
+    full vertex streams of the mesh.
+    """
+    # Loop vertices
+    loop_vertex_indices = mesh_data["loop_vertex_indices"]
+    loop_vertices = mesh_data["vertices"][loop_vertex_indices]
+
+    loop_triangles = mesh_data["loop_triangles"]
+    loop_triangle_materials = mesh_data["loop_triangle_materials"]
+    loop_normals = mesh_data["loop_normals"]
+    uvs = mesh_data["uvs"]
+
+    # Colors
+    rgba_colors = mesh_data["rgba_colors"]
+    rgb_colors = [rgba[:, :3] for rgba in rgba_colors]
+    alphas = [rgba[:, 3] for rgba in rgba_colors]
+    loop_rgb_colors = [col[loop_vertex_indices] for col in rgb_colors]
+    loop_alphas = [alpha[loop_vertex_indices] for alpha in alphas]
+
+    # Sort the triangles by material once, instead of scanning the whole
+    # triangle array once per material
+    mat_counts = mesh_data["mat_counts"]
+    mat_ends = np.cumsum(mat_counts)
+    if len(mat_counts) > 1:
+        order = np.argsort(loop_triangle_materials, kind="stable")
+        sorted_triangles = loop_triangles[order]
+    else:
+        sorted_triangles = loop_triangles
+    used_mats = np.flatnonzero(mat_counts)
+    # With only one material, all parts would reference (almost) all loops
+    partition = partition and len(used_mats) > 1
+
+    parts = []
+    for mat in used_mats:
+        end = mat_ends[mat]
+        mat_triangles = sorted_triangles[end - mat_counts[mat]:end]
+
+        if partition:
+            used_loops, local_indices = np.unique(
+                mat_triangles, return_inverse=True
             )
-            mesh_definitions.append((name, mat))
+            arrays = {
+                "points": loop_vertices[used_loops],
+                "triangles": local_indices.reshape(-1, 3).astype(np.uint32),
+                "normals": loop_normals[used_loops],
+                "uvs": [uv[used_loops] for uv in uvs],
+                "colors": [col[used_loops] for col in loop_rgb_colors],
+                "alphas": [alpha[used_loops] for alpha in loop_alphas],
+            }
+        else:
+            arrays = {
+                "points": loop_vertices,
+                "triangles": mat_triangles,
+                "normals": loop_normals,
+                "uvs": uvs,
+                "colors": loop_rgb_colors,
+                "alphas": loop_alphas,
+            }
+        parts.append((int(mat), arrays))
+    return parts
+
+
+def _get_progress_callback(engine, obj_name):
+    def progress(done, total):
+        if not engine:
+            return True
+        engine.update_stats(
+            "Exporting...", f"Mesh {obj_name} ({done * 100 // total}%)"
+        )
+        return not engine.test_break()
+    return progress
+
+
+def _build_parts_chunked(mesh_data, partition, progress):
+    """
+    Like _build_parts(), but processes the loops and triangles in chunks of
+    MESH_CHUNK_SIZE elements, using preallocated output and scratch buffers.
+    This avoids the temporary full-size copies of _build_parts() (e.g. the
+    sorted triangle array) and allows to report the progress of huge meshes.
+
+    progress(done, total) is called after each chunk and has to return False
+    if the conversion should be cancelled. Returns None in that case.
+    The source arrays are removed from mesh_data, so they can be freed early.
+    """
+    loop_vertex_indices = mesh_data.pop("loop_vertex_indices")
+    vertices = mesh_data.pop("vertices")
+    rgba_colors = mesh_data.pop("rgba_colors")
+    loop_triangles = mesh_data["loop_triangles"]
+    loop_triangle_materials = mesh_data["loop_triangle_materials"]
+    loop_normals = mesh_data["loop_normals"]
+    uvs = mesh_data["uvs"]
+    mat_counts = mesh_data["mat_counts"]
 
-        if exporter and exporter.stats:
-            exporter.stats.export_time_meshes.value += time() - start_time
+    used_mats = np.flatnonzero(mat_counts)
+    # With only one material, all parts would reference (almost) all loops
+    partition = partition and len(used_mats) > 1
+    loop_count = len(loop_vertex_indices)
+    triangle_count = len(loop_triangles)
 
-        return caches.exported_data.ExportedMesh(mesh_definitions)
+    # Partitioning needs two passes over the triangles (marking and remapping)
+    total = loop_count + triangle_count * (3 if partition else 1)
+    done = 0
+
+    # Loop vertices and colors
+    loop_vertices = np.empty((loop_count, 3), dtype=np.float32)
+    loop_rgb_colors = [np.empty((loop_count, 3), dtype=np.float32) for _ in rgba_colors]
+    loop_alphas = [np.empty(loop_count, dtype=np.float32) for _ in rgba_colors]
+
+    for start in range(0, loop_count, MESH_CHUNK_SIZE):
+        end = min(start + MESH_CHUNK_SIZE, loop_count)
+        indices = loop_vertex_indices[start:end]
+        np.take(vertices, indices, axis=0, out=loop_vertices[start:end])
+        for rgba, rgb, alpha in zip(rgba_colors, loop_rgb_colors, loop_alphas):
+            np.take(rgba[:, :3], indices, axis=0, out=rgb[start:end])
+            np.take(rgba[:, 3], indices, out=alpha[start:end])
+
+        done += end - start
+        if not progress(done, total):
+            return None
+
+    del loop_vertex_indices, vertices, rgba_colors
+
+    # Split the triangles by material. Only the chunks are sorted, the
+    # sorted triangles of each chunk are appended to the material arrays.
+    if len(used_mats) == 1:
+        mat_triangles = {used_mats[0]: loop_triangles}
+        done += triangle_count
+    else:
+        mat_triangles = {
+            mat: np.empty((mat_counts[mat], 3), dtype=np.uint32) for mat in used_mats
+        }
+        mat_offsets = np.zeros(len(mat_counts), dtype=np.int64)
+        sorted_chunk = np.empty((MESH_CHUNK_SIZE, 3), dtype=np.uint32)
+
+        for start in range(0, triangle_count, MESH_CHUNK_SIZE):
+            end = min(start + MESH_CHUNK_SIZE, triangle_count)
+            chunk_mats = loop_triangle_materials[start:end]
+            order = np.argsort(chunk_mats, kind="stable")
+            chunk_sorted = sorted_chunk[:end - start]
+            np.take(loop_triangles[start:end], order, axis=0, out=chunk_sorted)
+
+            chunk_counts = np.bincount(chunk_mats, minlength=len(mat_counts))
+            chunk_offset = 0
+            for mat in np.flatnonzero(chunk_counts):
+                count = chunk_counts[mat]
+                offset = mat_offsets[mat]
+                mat_triangles[mat][offset:offset + count] = chunk_sorted[chunk_offset:chunk_offset + count]
+                mat_offsets[mat] += count
+                chunk_offset += count
+
+            done += end - start
+            if not progress(done, total):
+                return None
+
+        del sorted_chunk
+
+    parts = []
+    if partition:
+        # Scratch buffers, shared by all materials
+        used = np.empty(loop_count, dtype=bool)
+        remap = np.empty(loop_count, dtype=np.uint32)
+
+    for mat in used_mats:
+        triangles = mat_triangles.pop(mat)
+
+        if partition:
+            used.fill(False)
+            for start in range(0, len(triangles), MESH_CHUNK_SIZE):
+                used[triangles[start:start + MESH_CHUNK_SIZE]] = True
+                done += len(triangles[start:start + MESH_CHUNK_SIZE])
+                if not progress(done, total):
+                    return None
+
+            # Sorted like the result of np.unique() in _build_parts()
+            used_loops = np.flatnonzero(used)
+            remap[used_loops] = np.arange(len(used_loops), dtype=np.uint32)
+
+            # The triangle array of this material is a copy, it can be remapped in place
+            for start in range(0, len(triangles), MESH_CHUNK_SIZE):
+                chunk = triangles[start:start + MESH_CHUNK_SIZE]
+                np.take(remap, chunk, out=chunk)
+                done += len(chunk)
+                if not progress(done, total):
+                    return None
+
+            arrays = {
+                "points": loop_vertices[used_loops],
+                "triangles": triangles,
+                "normals": loop_normals[used_loops],
+                "uvs": [uv[used_loops] for uv in uvs],
+                "colors": [col[used_loops] for col in loop_rgb_colors],
+                "alphas": [alpha[used_loops] for alpha in loop_alphas],
+            }
+        else:
+            arrays = {
+                "points": loop_vertices,
+                "triangles": triangles,
+                "normals": loop_normals,
+                "uvs": uvs,
+                "colors": loop_rgb_colors,
+                "alphas": loop_alphas,
+            }
+        parts.append((int(mat), arrays))
+    return parts
 
 
 @contextmanager
@@ -158,10 +468,9 @@ def _prepare_mesh(obj, depsgraph):
                     object_eval.to_mesh_clear()
                     mesh = None
 
-            # TODO implement new normals handling
-            if mesh:
-                mesh.split_faces()  # Applies smooth by angle operator
-
+        # Note: split_faces() is not called here, convert() only calls it when
+        # the mesh data has to be extracted (i.e. not on a mesh cache hit)
+        # TODO implement new normals handling
         yield mesh
     finally:
         if object_eval and mesh:
@@ -1,12 +1,19 @@
 import math
+import mathutils
+import numpy as np
 import pyluxcore
 from .. import utils
-from .caches.exported_data import ExportedObject, ExportedLight
+from .caches.exported_data import ExportedObject
 
 
 # TODO fix motion blur of area lights, they get a wrong transformation
 
-def convert(context, engine, scene, depsgraph, exported_objects):
+def convert(context, engine, scene, depsgraph, object_cache, instances=None):
+    """
+    instances: The Duplis of the fast dupli path (returned by ObjectCache2.first_run()).
+    Their per-step matrices are collected in the same frame_set() passes and
+    exported later in ObjectCache2.duplicate_instances().
+    """
     assert scene.camera
     motion_blur = scene.camera.data.luxcore.motion_blur
     assert motion_blur.enable and (motion_blur.object_blur or motion_blur.camera_blur)
@@ -15,7 +22,8 @@ def convert(context, engine, scene, depsgraph, exported_objects):
     assert steps >= 2 and isinstance(steps, int)
 
     frame_offsets = _calc_frame_offsets(motion_blur.shutter, steps)
-    matrices = _get_matrices(context, engine, scene, steps, frame_offsets, depsgraph, exported_objects)
+    object_rows = ObjectRows(object_cache, steps)
+    matrices = _get_matrices(context, engine, scene, steps, frame_offsets, depsgraph, object_rows, instances)
 
     # Find and delete entries of non-moving objects (where all matrices are equal)
     for prefix, matrix_steps in list(matrices.items()):
@@ -29,30 +37,87 @@ def convert(context, engine, scene, depsgraph, exported_objects):
     props = pyluxcore.Properties()
 
     for prefix, matrix_steps in matrices.items():
-        for step in range(steps):
-            time = frame_offsets[step]
-            matrix = matrix_steps[step]
-            transformation = utils.luxutils.matrix_to_list(matrix)
-            definitions = {
-                "motion.%d.time" % step: time,
-                "motion.%d.transformation" % step: transformation,
-            }
-            props.Set(utils.luxutils.create_props(prefix, definitions))
+        _set_motion_props(props, prefix, frame_offsets, matrix_steps)
+
+    for row in object_rows.get_moving_rows():
+        matrix_steps = [
+            mathutils.Matrix(object_rows.matrices[step, row].reshape(4, 4).tolist())
+            for step in range(steps)
+        ]
+        for prefix in object_rows.prefixes[row]:
+            _set_motion_props(props, prefix, frame_offsets, matrix_steps)
 
     # We need this information outside
     is_camera_moving = "scene.camera." in matrices
     return props, is_camera_moving
 
 
+class ObjectRows:
+    """
+    Matrices of the exported objects for all motion steps, one row per object.
+    The rows are looked up with utils.get_instance_identity(), which is much
+    cheaper than computing the object keys for every instance in every step.
+    """
+
+    def __init__(self, object_cache, steps):
+        self.rows = {}  # {instance identity: row}
+        self.prefixes = []  # Property prefixes of the object parts, per row
+
+        for identity, obj_key in object_cache.instance_index.items():
+            exported_thing = object_cache.exported_objects.get(obj_key)
+            # Lights are not supported yet, see TODO at the top of the file
+            if isinstance(exported_thing, ExportedObject):
+                self.rows[identity] = len(self.prefixes)
+                self.prefixes.append(["scene.objects." + part.lux_obj + "." for part in exported_thing.parts])
+
+        count = len(self.prefixes)
+        self.matrices = np.empty((steps, count, 16), dtype=np.float32)
+        # Objects can disappear in some steps, e.g. particles that die during the shutter time
+        self.captured = np.zeros((steps, count), dtype=bool)
+
+    def capture(self, dg_obj_instance, step):
+        row = self.rows.get(utils.get_instance_identity(dg_obj_instance))
+        if row is None:
+            # This is not a problem, objects are skipped during export for various reasons
+            # E.g. if the object is not visible, or if it's a camera
+            return
+        self.matrices[step, row].reshape(4, 4)[:] = dg_obj_instance.matrix_world
+        self.captured[step, row] = True
+
+    def get_moving_rows(self):
+        if not self.prefixes:
+            return []
+        complete = self.captured.all(axis=0)
+        static = (self.matrices == self.matrices[0]).all(axis=(0, 2))
+        return np.flatnonzero(complete & ~static)
+
+
+def _set_motion_props(props, prefix, frame_offsets, matrix_steps):
+    for step, matrix in enumerate(matrix_steps):
+        time = frame_offsets[step]
+        transformation = utils.luxutils.matrix_to_list(matrix)
+        definitions = {
+            "motion.%d.time" % step: time,
+            "motion.%d.transformation" % step: transformation,
+        }
+        props.Set(utils.luxutils.create_props(prefix, definitions))
+
+
 def _calc_frame_offsets(shutter, steps):
     """ Return a list of offsets (unit: frame) to step through in _get_matrices() """
     step_interval = shutter / (steps - 1)
     return [step_interval * step - shutter / 2 for step in range(steps)]
 
 
-def _get_matrices(context, engine, scene, steps, frame_offsets, depsgraph, exported_objects):
+def _get_matrices(context, engine, scene, steps, frame_offsets, depsgraph, object_rows, instances=None):
     motion_blur = scene.camera.data.luxcore.motion_blur
-    matrices = {}  # {prefix: [matrix1, matrix2, ...]}
+    matrices = {}  # {prefix: [matrix1, matrix2, ...]}, only used for the camera
+
+    all_duplis = []
+    if motion_blur.object_blur and instances:
+        all_duplis = [duplis for duplis in instances.values() if duplis]
+        for duplis in all_duplis:
+            duplis.motion_times = frame_offsets
 
     frame_center = scene.frame_current
     subframe_center = scene.frame_subframe
@@ -63,42 +128,44 @@ def _get_matrices(context, engine, scene, steps, frame_offsets, depsgraph, expor
         subframe = frame - frame_int
         engine.frame_set(frame_int, subframe)
         if motion_blur.object_blur:
-            _append_object_matrices(depsgraph, exported_objects, matrices, step)
+            for duplis in all_duplis:
+                duplis.begin_motion_step()
+            _capture_object_matrices(depsgraph, object_rows, step, instances)
+            for duplis in all_duplis:
+                duplis.end_motion_step()
 
         if motion_blur.camera_blur and not context:
             matrix = scene.camera.matrix_world
 
             prefix = "scene.camera."
-            _append_matrix(matrices, prefix, matrix, step)
+            _append_matrix(matrices, prefix, matrix.copy(), step)
 
     # Restore original frame
     engine.frame_set(frame_center, subframe_center)
     return matrices
 
 
-def _append_object_matrices(depsgraph, exported_objects, matrices, step):
+def _capture_object_matrices(depsgraph, object_rows, step, instances=None):
+    # Objects whose first instance was already seen in this step,
+    # all following instances belong to the Duplis (see ObjectCache2.first_run())
+    seen_duplis = set()
+
     for dg_obj_instance in depsgraph.object_instances:
         obj = dg_obj_instance.parent if dg_obj_instance.is_instance else dg_obj_instance.object
+
+        if instances and dg_obj_instance.is_instance and dg_obj_instance.object.type in utils.MESH_OBJECTS:
+            obj_pointer = dg_obj_instance.object.original.as_pointer()
+            if obj_pointer in seen_duplis:
+                duplis = instances.get(obj_pointer)
+                if duplis:
+                    duplis.add_motion_matrix(dg_obj_instance, obj.luxcore.enable_motion_blur)
+                continue
+            seen_duplis.add(obj_pointer)
+
         if not obj.luxcore.enable_motion_blur:
             continue
 
-        obj_key = utils.make_key_from_instance(dg_obj_instance)
-        matrix = dg_obj_instance.matrix_world.copy()
-
-        try:
-            exported_thing = exported_objects[obj_key]
-            if isinstance(exported_thing, ExportedObject):
-                for part in exported_thing.parts:
-                    prefix = "scene.objects." + part.lux_obj + "."
-                    _append_matrix(matrices, prefix, matrix, step)
-            # else:
-            #     assert isinstance(exported_thing, ExportedLight)
-            #     prefix = "scene.lights." + exported_thing.lux_light_name + "."
-            #     _append_matrix(matrices, prefix, matrix, step)
-        except KeyError:
-            # This is not a problem, objects are skipped during export for various reasons
-            # E.g. if the object is not visible, or if it's a camera
-            pass
+        object_rows.capture(dg_obj_instance, step)
 
 
 def _append_matrix(matrices, prefix, matrix, step):
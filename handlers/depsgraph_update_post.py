@@ -1,8 +1,16 @@
 import bpy
 from bpy.app.handlers import persistent
+from ..export.caches import SessionPropsUpdates
+from ..export.image import ImageExporter
 
 @persistent
-def handler(scene):
+def handler(scene, depsgraph=None):
+    # Tell a running final render to check the imagepipeline and halt conditions
+    SessionPropsUpdates.check(depsgraph)
+
+    if depsgraph is None or depsgraph.id_type_updated("IMAGE"):
+        ImageExporter.forget_packed_keys()
+
     # If material name was changed, rename the node tree, too.
     for mat in bpy.data.materials:
         node_tree = mat.luxcore.node_tree
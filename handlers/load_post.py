@@ -90,7 +90,8 @@ def handler(_):
         _init_persistent_cache_file_path(scene.luxcore.config.envlight_cache, "env")
         _init_persistent_cache_file_path(scene.luxcore.config.dls_cache, "dlsc")
 
-        _init_LuxCoreOnlineLibrary()
+        if utils.LOAD_UI_MODULES:
+            _init_LuxCoreOnlineLibrary()
 
     # Run converters for backwards compatibility
     compatibility.run()
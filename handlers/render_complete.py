@@ -0,0 +1,13 @@
+import bpy
+from bpy.app.handlers import persistent
+from ..engine import final
+
+
+@persistent
+def handler(scene, _=None):
+    """
+    Also registered as render_cancel handler.
+    The scenes kept between the frames of an animation render can use several GB,
+    release them when the render job ends (also if it was cancelled between two frames)
+    """
+    final.clear_reused_scenes()
@@ -60,6 +60,27 @@ def _hash_wheels(wheels):
     return wheel_hash.hexdigest()
 
 
+def _get_wheel_manifest(wheels):
+    """Hash the names, sizes and modification times of wheel requirements.
+
+    Unlike `_hash_wheels`, the wheel files are not read, only stat'ed, so this
+    is cheap enough to be done at every startup. If the manifest did not change
+    since the last installation, the wheels are not hashed again.
+    """
+    manifest = hashlib.sha256()
+    for wheel in wheels:
+        if isinstance(wheel, str):
+            manifest.update(wheel.encode())
+        elif isinstance(wheel, pathlib.Path):
+            stat = wheel.stat()
+            manifest.update(
+                f"{wheel.resolve()}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode()
+            )
+        else:
+            raise TypeError("Unhandled Wheel requirement type")
+    return manifest.hexdigest()
+
+
 def _download_wheels(wheel_requirements, no_deps, no_index):
     """Download wheels from wheel requirements."""
     no_deps = bool(no_deps)
@@ -113,7 +134,7 @@ INSTALL_INFO_HEADER = """\
 """
 
 
-def _save_installation_info(whl_hash):
+def _save_installation_info(whl_hash, whl_manifest):
     """Save information from the last installation.
 
     Only one of the supplied arguments should be different from 'None'
@@ -122,7 +143,7 @@ def _save_installation_info(whl_hash):
     assert whl_hash
     info_file = ROOT_FOLDER / "pyluxcore_installation_info.txt"
     config = configparser.ConfigParser()
-    config["WHEELS"] = {"hash": whl_hash}
+    config["WHEELS"] = {"hash": whl_hash, "manifest": whl_manifest}
 
     with open(info_file, "w", encoding="utf-8") as f:
         f.write(INSTALL_INFO_HEADER)
@@ -140,24 +161,27 @@ def _get_installation_info():
     print(f"[BLC] Checking installation info ('{info_file}')")
 
     if not info_file.exists:
-        return None
+        return None, None
 
     config = configparser.ConfigParser()
     try:
         config.read([info_file], encoding="utf-8")
     except FileNotFoundError:
-        return None
+        return None, None
     except configparser.MissingSectionHeaderError:
         print("[BLC] - Warning - Malformed info file")
-        return None
+        return None, None
 
     try:
         old_wheel_hash = config["WHEELS"]["hash"]
     except KeyError:
         print("[BLC] Warning - Missing hash in info file content")
-        return None
+        return None, None
+
+    # Missing in info files written by older versions
+    old_wheel_manifest = config["WHEELS"].get("manifest")
 
-    return old_wheel_hash
+    return old_wheel_hash, old_wheel_manifest
 
 
 def _clear_wheels():
@@ -327,7 +351,7 @@ def _fetch_wheels():
     no_index = bool(settings.get("no_index", False))
 
     # Get installation info for comparison in the following steps
-    old_wheel_hash = _get_installation_info()
+    old_wheel_hash, old_wheel_manifest = _get_installation_info()
 
     # Case #1 (standard case): Get wheel from PyPI
     if wheel_source == WheelSource.PYPI:
@@ -344,7 +368,7 @@ def _fetch_wheels():
         path_to_wheel = pathlib.Path(settings.get("path_to_wheel", ""))
         if not (path_to_wheel.is_file() and path_to_wheel.is_absolute()):
             print(f"[BLC] Wheel file not found ('{path_to_wheel}')")
-            return FetchWheelStatus.ERROR, None
+            return FetchWheelStatus.ERROR, None, None
 
         # Get optional folder with dependencies
         additional_deps = []
@@ -374,10 +398,23 @@ def _fetch_wheels():
     else:
         raise ValueError(f"Unhandled wheel source setting ({wheel_source})")
 
+    # Check cache: if the wheel files were not modified since the last
+    # installation, skip reading and hashing them
+    wheel_manifest = _get_wheel_manifest(wheels)
+    if (
+        not reinstall_upon_reloading
+        and old_wheel_hash
+        and wheel_manifest == old_wheel_manifest
+    ):
+        return FetchWheelStatus.CACHE, old_wheel_hash, wheel_manifest
+
     # Check cache (hash and compare)
     wheel_hash = _hash_wheels(wheels)
     if not reinstall_upon_reloading and wheel_hash == old_wheel_hash:
-        return FetchWheelStatus.CACHE, wheel_hash
+        # Same content, e.g. the wheel was copied again: remember the new
+        # modification times, so the next startup can skip the hashing
+        _save_installation_info(wheel_hash, wheel_manifest)
+        return FetchWheelStatus.CACHE, wheel_hash, wheel_manifest
 
     # Download
     _backup_wheels()
@@ -387,9 +424,9 @@ def _fetch_wheels():
         print(f"[BLC] Unexpected {err=}, {type(err)=}")
         _clear_wheels()
         _restore_backup_wheels()
-        result = FetchWheelStatus.ERROR, None
+        result = FetchWheelStatus.ERROR, None, None
     else:
-        result = FetchWheelStatus.OK, wheel_hash
+        result = FetchWheelStatus.OK, wheel_hash, wheel_manifest
     finally:
         _delete_backup_wheels()
 
@@ -411,7 +448,7 @@ def ensure_pyluxcore():
 
     # Fetch wheels (download or copy from local source, depending on settings)
     # and install them
-    fetch_result, wheel_hash = _fetch_wheels()
+    fetch_result, wheel_hash, wheel_manifest = _fetch_wheels()
 
     if fetch_result == FetchWheelStatus.OK:
         # Install wheels
@@ -421,7 +458,7 @@ def ensure_pyluxcore():
         except ValueError:
             print("[BLC] No wheel installed - BlendLuxCore may be unusable")
         else:
-            _save_installation_info(wheel_hash)
+            _save_installation_info(wheel_hash, wheel_manifest)
     elif fetch_result == FetchWheelStatus.CACHE:
         # Wheels have been found in cache and thus are already installed:
         # => Nothing to do
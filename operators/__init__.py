@@ -15,7 +15,6 @@ import bpy
 from .. import utils as blc_utils
 
 from . import (
-    lol,
     camera,
     debug,
     general,
@@ -28,15 +27,16 @@ from . import (
     material,
     multi_image_import,
     node_editor,
-    node_tree_presets,
     pointer_node,
-    pyluxcoretools,
     render,
     render_settings_helper,
     texture,
     world,
 )
 
+if blc_utils.LOAD_UI_MODULES:
+    from . import lol, node_tree_presets, pyluxcoretools
+
 
 if _needs_reload:
     import importlib
@@ -53,15 +53,14 @@ if _needs_reload:
         material,
         multi_image_import,
         node_editor,
-        node_tree_presets,
         pointer_node,
-        pyluxcoretools,
         render,
         render_settings_helper,
         texture,
         world,
-        lol,
     )
+    if blc_utils.LOAD_UI_MODULES:
+        modules += (node_tree_presets, pyluxcoretools, lol)
     for module in modules:
         importlib.reload(module)
 
@@ -115,14 +114,10 @@ classes = (
     node_editor.LUXCORE_OT_node_editor_viewer,
     node_editor.LUXCORE_OT_mute_node,
     node_editor.LUXCORE_OT_node_editor_add_image,
-    node_tree_presets.LUXCORE_OT_preset_material,
-    node_tree_presets.LUXCORE_MATERIAL_MT_node_tree_preset,
     pointer_node.LUXCORE_OT_pointer_unlink_node_tree,
     pointer_node.LUXCORE_OT_pointer_set_node_tree,
     pointer_node.LUXCORE_MT_pointer_select_node_tree,
     pointer_node.LUXCORE_OT_pointer_show_node_tree,
-    pyluxcoretools.LUXCORE_OT_install_pyside,
-    pyluxcoretools.LUXCORE_OT_start_pyluxcoretools,
     render.LUXCORE_OT_request_denoiser_refresh,
     render.LUXCORE_OT_request_display_refresh,
     render.LUXCORE_OT_toggle_pause,
@@ -142,7 +137,16 @@ classes = (
     world.LUXCORE_OT_create_sun_hemi,
 )
 
-submodules = (lol, keymaps)
+submodules = (keymaps,)
+
+if blc_utils.LOAD_UI_MODULES:
+    classes += (
+        node_tree_presets.LUXCORE_OT_preset_material,
+        node_tree_presets.LUXCORE_MATERIAL_MT_node_tree_preset,
+        pyluxcoretools.LUXCORE_OT_install_pyside,
+        pyluxcoretools.LUXCORE_OT_start_pyluxcoretools,
+    )
+    submodules = (lol,) + submodules
 
 def register():
     blc_utils.register_module("Operators", classes, submodules)
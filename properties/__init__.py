@@ -24,9 +24,11 @@ from . import (
     scene,
     view_layer,
     world,
-    lol,
 )
 
+if utils.LOAD_UI_MODULES:
+    from . import lol
+
 # TODO
 from .ies import LuxCoreIESProps
 
@@ -56,8 +58,9 @@ if _needs_reload:
         scene,
         view_layer,
         world,
-        lol,
     )
+    if utils.LOAD_UI_MODULES:
+        modules += (lol,)
     for module in modules:
         importlib.reload(module)
 
@@ -89,6 +92,7 @@ classes = (
     config.LuxCoreConfigEnvLightCache,
     config.LuxCoreConfigNoiseEstimation,
     config.LuxCoreConfigImageResizePolicy,
+    config.LuxCoreConfigExport,
     config.LuxCoreConfig,
     debug.LuxCoreDebugSettings,
     denoiser.LuxCoreDenoiser,
@@ -110,7 +114,7 @@ classes = (
     world.LuxCoreWorldProps,
 )
 
-submodules = (lol,)
+submodules = (lol,) if utils.LOAD_UI_MODULES else ()
 
 
 def register():
@@ -402,6 +402,65 @@ class LuxCoreConfigImageResizePolicy(PropertyGroup):
         return utils.luxutils.create_props(prefix, definitions)
 
 
+MESH_CACHE_DESC = (
+    "Store the converted mesh data on disk and re-use it in later renders and animation frames "
+    "if the mesh did not change. The cache directory and size limit can be set in the addon preferences"
+)
+
+PARTITION_MESHES_DESC = (
+    "Send each material part of a mesh to LuxCore with only the face corners used by its "
+    "triangles, instead of the face corner data of the whole mesh. Reduces memory usage of "
+    "meshes with many materials"
+)
+
+REUSE_SCENE_DESC = (
+    "In animation renders, keep the LuxCore scene of the previous frame and only update moved or changed "
+    "objects and lights, moved instances, the camera and animated materials. Falls back to a full export "
+    "if new objects are instanced. The render session is paused between the frames and "
+    "updated with a scene edit. Not used with motion blur"
+)
+
+REBUILD_INTERVAL_DESC = (
+    "Export the whole scene from scratch after this many reused frames, "
+    "to drop data that is no longer used by the animation"
+)
+
+MEMORY_BUDGET_DESC = (
+    "When Blender uses more memory than this during the export, the collected scene "
+    "properties are parsed into the LuxCore scene early instead of being kept until the "
+    "end of the export. Not used when motion blur is enabled (0 = disabled)"
+)
+
+PROPS_BATCH_SIZE_DESC = (
+    "Parse the scene properties into LuxCore after this many objects, instead of once at "
+    "the end of the export. Not used when motion blur is enabled (0 = disabled)"
+)
+
+MESH_THREADS_DESC = (
+    "Number of threads that process the mesh data in final render while the next meshes are read "
+    "from Blender (0 = one thread per CPU core, 1 = no extra threads). Experimental"
+)
+
+
+class LuxCoreConfigExport(PropertyGroup):
+    """
+    Settings that only affect the speed and memory usage of the scene export,
+    not the rendered image
+    """
+    use_mesh_cache: BoolProperty(name="Persistent Mesh Cache", default=False, description=MESH_CACHE_DESC)
+    partition_meshes: BoolProperty(name="Compact Multi-Material Meshes", default=False,
+                                   description=PARTITION_MESHES_DESC)
+    reuse_scene: BoolProperty(name="Reuse Scene in Animation", default=False, description=REUSE_SCENE_DESC)
+    rebuild_interval: IntProperty(name="Full Rebuild Interval", default=50, min=1, soft_max=500,
+                                  description=REBUILD_INTERVAL_DESC)
+    mesh_threads: IntProperty(name="Mesh Threads", default=1, min=0, soft_max=64,
+                              description=MESH_THREADS_DESC)
+    memory_budget: FloatProperty(name="Memory Budget (GiB)", default=0, min=0, soft_max=256,
+                                 description=MEMORY_BUDGET_DESC)
+    props_batch_size: IntProperty(name="Parse Batch Size", default=0, min=0, soft_max=100000,
+                                  description=PROPS_BATCH_SIZE_DESC)
+
+
 class LuxCoreConfig(PropertyGroup):
     """
     Main config storage class.
@@ -571,6 +630,8 @@ class LuxCoreConfig(PropertyGroup):
 
     image_resize_policy: PointerProperty(type=LuxCoreConfigImageResizePolicy)
 
+    export: PointerProperty(type=LuxCoreConfigExport)
+
     def using_only_lighttracing(self):
         return (self.engine == "PATH" and self.device == "CPU" and self.path.hybridbackforward_enable
                 and self.path.hybridbackforward_lightpartition == 100)
@@ -9,6 +9,11 @@ class LuxCoreDisplaySettings(bpy.types.PropertyGroup):
 
     interval: IntProperty(name="Refresh Interval (s)", default=10, min=5,
                            description="Time between film refreshes, in seconds")
+    aov_interval: IntProperty(name="AOV Refresh Interval", default=3, min=1, soft_max=20,
+                              description="Import AOVs and light groups only on every n-th film refresh. "
+                                          "Geometric AOVs (depth, normals, IDs etc.) are imported once after "
+                                          "the first pass. The pass shown in the image editor is imported on every "
+                                          "refresh. All passes are imported when the render stops")
 
     show_converged: BoolProperty(name="Highlight Converged Tiles", default=True,
                                   description="Mark tiles that are no longer rendered with green outline")
@@ -241,6 +241,13 @@ class LuxCoreHair(PropertyGroup):
         description=VERTEX_COL_MULTIPLIERS_DESC,
     )
 
+    use_radius_attribute: BoolProperty(
+        name="Use Radius Attribute",
+        default=False,
+        description="Hair Curves only: derive the thickness from the radius attribute of the curves. "
+        "The average radius at the roots and tips of all strands is used",
+    )
+
     instancing: EnumProperty(
         name="Optimization",
         default="disabled",
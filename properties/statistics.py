@@ -9,6 +9,9 @@ from ..utils.statistics import (
     get_rounded,
     get_vram_usage,
     greater_is_better,
+    instances_per_sec_to_string,
+    memory_better,
+    memory_usage_to_string,
     path_depths_to_string,
     rays_per_sample_to_string,
     samples_per_sec_to_string,
@@ -38,12 +41,38 @@ class LuxCoreRenderStats:
         categories.append("Startup")
         self.export_time = Stat("Export Time", categories[-1],
                                 0, smaller_is_better, time_to_string, get_rounded)
+        self.compatibility_time = Stat("    Compatibility Check Time", categories[-1],
+                                       0, smaller_is_better, time_to_string, get_rounded)
         self.export_time_meshes = Stat("    Mesh Export Time", categories[-1],
                                        0, smaller_is_better, time_to_string, get_rounded)
         self.export_time_hair = Stat("    Hair Export Time", categories[-1],
                                      0, smaller_is_better, time_to_string, get_rounded)
         self.export_time_instancing = Stat("    Instancing Time", categories[-1],
                                            0, smaller_is_better, time_to_string, get_rounded)
+        self.instance_count = Stat("    Instances", categories[-1], 0, string_func=triangle_count_to_string)
+        self.instancing_rate = Stat("    Instancing Rate", categories[-1],
+                                    0, greater_is_better, instances_per_sec_to_string, get_rounded)
+        self.mesh_cache_hits = Stat("    Mesh Cache Hits", categories[-1], 0, greater_is_better)
+        self.export_time_images = Stat("    Packed Image Export Time", categories[-1],
+                                       0, smaller_is_better, time_to_string, get_rounded)
+        self.image_cache_hits = Stat("    Image Cache Hits", categories[-1], 0, greater_is_better)
+        self.material_cache_hits = Stat("    Material Cache Hits", categories[-1], 0, greater_is_better)
+        self.material_cache_misses = Stat("    Material Cache Misses", categories[-1], 0, smaller_is_better)
+        self.export_memory = Stat("Export Memory", categories[-1],
+                                  (0, 0), memory_better, memory_usage_to_string)
+        self.memory_meshes = Stat("    Mesh Memory", categories[-1],
+                                  (0, 0), memory_better, memory_usage_to_string)
+        self.memory_hair = Stat("    Hair Memory", categories[-1],
+                                (0, 0), memory_better, memory_usage_to_string)
+        self.memory_instancing = Stat("    Instancing Memory", categories[-1],
+                                      (0, 0), memory_better, memory_usage_to_string)
+        self.memory_materials = Stat("    Material Memory", categories[-1],
+                                     (0, 0), memory_better, memory_usage_to_string)
+        self.memory_parse = Stat("    Props Parse Memory", categories[-1],
+                                 (0, 0), memory_better, memory_usage_to_string)
+        self.props_parse_time = Stat("    Props Parse Time", categories[-1],
+                                     0, smaller_is_better, time_to_string, get_rounded)
+        self.props_batch_count = Stat("    Props Batches", categories[-1], 0)
         self.session_init_time = Stat("Session Init Time", categories[-1],
                                       0, smaller_is_better, time_to_string, get_rounded)
         categories.append("Scene")
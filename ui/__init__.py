@@ -23,10 +23,12 @@ from . import (
     view_layer_aovs,
     volume,
     world,
-    lol,
     render,
 )
 
+if utils.LOAD_UI_MODULES:
+    from . import lol
+
 
 if _needs_reload:
     import importlib
@@ -49,7 +51,8 @@ if _needs_reload:
     view_layer_aovs = importlib.reload(view_layer_aovs)
     volume = importlib.reload(volume)
     world = importlib.reload(world)
-    lol = importlib.reload(lol)
+    if utils.LOAD_UI_MODULES:
+        lol = importlib.reload(lol)
     render = importlib.reload(render)
 
 classes = (
@@ -112,7 +115,6 @@ classes = (
 )
 
 submodules = (
-    lol,
     render,
     blender_object,
     camera,
@@ -127,6 +129,9 @@ submodules = (
     world
 )
 
+if utils.LOAD_UI_MODULES:
+    submodules = (lol,) + submodules
+
 
 def register():
     utils.register_module("UI", classes, submodules)
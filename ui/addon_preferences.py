@@ -1,5 +1,6 @@
 """Addon Preferences user interface."""
 
+import os
 from importlib.metadata import version
 
 _needs_reload = "bpy" in locals()
@@ -161,6 +162,43 @@ class LuxCoreAddonPreferences(AddonPreferences):
 
     display_luxcore_logs: BoolProperty(name="Show LuxCore Logs", default=True)
 
+    # Persistent export caches
+    cache_dir: StringProperty(
+        name="Cache Directory",
+        description=(
+            "Where the persistent export caches are stored. "
+            "If empty, a directory in the Blender user extension "
+            "folder is used"
+        ),
+        subtype="DIR_PATH",
+        default="",
+    )
+    mesh_cache_max_size: IntProperty(
+        name="Mesh Cache Size Limit (GiB)",
+        description=(
+            "When the mesh cache grows larger than this, the least "
+            "recently used entries are deleted. 0 means no limit"
+        ),
+        default=20,
+        min=0,
+    )
+    image_cache_max_size: IntProperty(
+        name="Image Cache Size Limit (GiB)",
+        description=(
+            "Packed and generated images are stored in the image cache. "
+            "When it grows larger than this, the least recently used "
+            "entries are deleted. 0 means no limit"
+        ),
+        default=10,
+        min=0,
+    )
+
+    def get_cache_dir(self, name):
+        """Return the directory of the persistent cache with this name."""
+        if self.cache_dir:
+            return os.path.join(bpy.path.abspath(self.cache_dir), name)
+        return str(utils.get_user_dir(os.path.join("cache", name)))
+
     # Read-only string property, returns the current date
     def get_pyluxcore_version(self):
         """Provide pyluxcore version."""
@@ -232,6 +270,22 @@ class LuxCoreAddonPreferences(AddonPreferences):
         split.label(text="LuxCore Logs:")
         split.prop(self, "display_luxcore_logs")
 
+        # Persistent export caches
+        row = layout.row()
+        split = row.split(factor=SPLIT_FACTOR)
+        split.label(text="Cache Directory:")
+        split.prop(self, "cache_dir", text="")
+
+        row = layout.row()
+        split = row.split(factor=SPLIT_FACTOR)
+        split.label(text="Mesh Cache Size Limit:")
+        split.prop(self, "mesh_cache_max_size", text="GiB")
+
+        row = layout.row()
+        split = row.split(factor=SPLIT_FACTOR)
+        split.label(text="Image Cache Size Limit:")
+        split.prop(self, "image_cache_max_size", text="GiB")
+
         # pyluxcore version
         row = layout.row()
         split = row.split(factor=SPLIT_FACTOR)
@@ -21,11 +21,14 @@ class LUXCORE_DATA_PT_curve_hair(DataButtonsPanel, Panel):
         layout.use_property_split = True
         layout.use_property_decorate = False
 
-        layout.prop(settings, "hair_size")
+        layout.prop(settings, "use_radius_attribute")
 
         col = layout.column(align=True)
+        col.active = not settings.use_radius_attribute
+        col.prop(settings, "hair_size")
         col.prop(settings, "root_width")
         col.prop(settings, "tip_width")
+        col = layout.column(align=True)
         col.prop(settings, "width_offset")
 
         layout.prop(settings, "tesseltype")
@@ -74,6 +77,10 @@ class LUXCORE_DATA_PT_curve_hair(DataButtonsPanel, Panel):
         if settings.export_color == "vertex_color":
             col = box.column(align=True)
             col.prop(settings, "use_active_vertex_color_layer")
+            if not settings.use_active_vertex_color_layer:
+                col.prop_search(settings, "vertex_color_layer_name",
+                                obj.data, "attributes",
+                                icon="GROUP_VCOL", text="Color Attribute")
         #
         #     if settings.use_active_vertex_color_layer:
         #         if obj.data.vertex_colors:
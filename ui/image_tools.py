@@ -44,6 +44,7 @@ class LUXCORE_IMAGE_PT_display(Panel, LuxCoreImagePanel):
         template_refresh_button(LuxCoreDisplaySettings.refresh, "luxcore.request_display_refresh",
                                 layout, "Refreshing film...")
         layout.prop(display, "interval")
+        layout.prop(display, "aov_interval")
 
         if config.engine == "PATH" and config.use_tiles:
             col = layout.column(align=True)
@@ -1,6 +1,5 @@
 from bl_ui.properties_material import MaterialButtonsPanel, MATERIAL_PT_viewport
 from bpy.types import Panel, Menu
-from ..operators.node_tree_presets import LUXCORE_OT_preset_material
 from .. import icons
 
 original_viewport_draw = None
@@ -113,6 +112,9 @@ class LUXCORE_PT_material_presets(MaterialButtonsPanel, Panel):
         return engine == "LUXCORE"
 
     def draw(self, context):
+        # Imported here because the presets are not loaded in background mode
+        from ..operators.node_tree_presets import LUXCORE_OT_preset_material
+
         layout = self.layout
 
         row = layout.row()
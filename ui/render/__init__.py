@@ -1,5 +1,5 @@
 from ... import utils
-from . import caches, config, debug, denoiser, devices, errorlog, halt, image_resize_policy, sampling, tools, viewport
+from . import caches, config, debug, denoiser, devices, errorlog, export, halt, image_resize_policy, sampling, tools, viewport
 
 classes = (
     caches.LUXCORE_RENDER_PT_caches,
@@ -23,6 +23,7 @@ classes = (
     devices.LUXCORE_RENDER_PT_gpu_devices,
     devices.LUXCORE_RENDER_PT_cpu_devices,
     errorlog.LUXCORE_RENDER_PT_error_log,
+    export.LUXCORE_RENDER_PT_export,
     halt.LUXCORE_RENDER_PT_halt_conditions,
     halt.LUXCORE_RENDERLAYER_PT_halt_conditions,
     sampling.LUXCORE_RENDER_PT_sampling,
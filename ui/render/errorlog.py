@@ -4,6 +4,9 @@ from ... import icons
 from ...icons import icon_manager
 from ...utils.errorlog import LuxCoreErrorLog
 
+# Number of objects listed below a message that was reported for several objects
+MAX_OBJECTS_SHOWN = 10
+
 class LUXCORE_RENDER_PT_error_log(RenderButtonsPanel, Panel):
     COMPAT_ENGINES = {"LUXCORE"}
     bl_label = "Error Log"
@@ -30,6 +33,9 @@ class LUXCORE_RENDER_PT_error_log(RenderButtonsPanel, Panel):
 
         self._draw(LuxCoreErrorLog.errors, "Errors:", icons.ERROR)
         self._draw(LuxCoreErrorLog.warnings, "Warnings:", icons.WARNING)
+
+        if LuxCoreErrorLog.dropped_count:
+            self.layout.label(text=f"{LuxCoreErrorLog.dropped_count} more messages not shown")
         
     def _draw(self, errors_or_warnings, label, icon=icons.NONE):
         if len(errors_or_warnings) == 0:
@@ -46,11 +52,32 @@ class LUXCORE_RENDER_PT_error_log(RenderButtonsPanel, Panel):
 
             text = elem.message
             if elem.count > 1:
-                text += str(elem.count) + "x"
+                text += " (%dx)" % elem.count
 
-            row.label(text=elem.message, icon=icon)
-            if elem.obj_name:
+            row.label(text=text, icon=icon)
+            if len(elem.objects) == 1 and elem.obj_name:
                 op = row.operator("luxcore.select_object", text="", icon=icons.OBJECT)
                 op.obj_name = elem.obj_name
             op = row.operator("luxcore.copy_error_to_clipboard", icon=icons.COPY_TO_CLIPBOARD)
             op.message = elem.message
+
+            if len(elem.objects) > 1:
+                self._draw_objects(box, elem)
+
+    def _draw_objects(self, layout, elem):
+        col = layout.column(align=True)
+        obj_names = [obj_name for obj_name in elem.objects if obj_name]
+
+        for obj_name in obj_names[:MAX_OBJECTS_SHOWN]:
+            row = col.row()
+            row.separator()
+            count = elem.objects[obj_name]
+            row.label(text=obj_name if count == 1 else "%s (%dx)" % (obj_name, count))
+            op = row.operator("luxcore.select_object", text="", icon=icons.OBJECT)
+            op.obj_name = obj_name
+
+        hidden_count = len(obj_names[MAX_OBJECTS_SHOWN:]) + elem.omitted_count
+        if hidden_count:
+            row = col.row()
+            row.separator()
+            row.label(text="... and %d more" % hidden_count)
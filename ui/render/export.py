@@ -0,0 +1,38 @@
+from bl_ui.properties_render import RenderButtonsPanel
+from bpy.types import Panel
+from ...icons import icon_manager
+
+
+class LUXCORE_RENDER_PT_export(Panel, RenderButtonsPanel):
+    bl_label = "Export Performance"
+    COMPAT_ENGINES = {"LUXCORE"}
+    bl_options = {"DEFAULT_CLOSED"}
+    bl_order = 105
+
+    @classmethod
+    def poll(cls, context):
+        return context.scene.render.engine == "LUXCORE"
+
+    def draw_header(self, context):
+        layout = self.layout
+        layout.label(text="", icon_value=icon_manager.get_icon_id("logotype"))
+
+    def draw(self, context):
+        export_settings = context.scene.luxcore.config.export
+
+        layout = self.layout
+        layout.use_property_split = True
+        layout.use_property_decorate = False
+
+        col = layout.column(align=True)
+        col.prop(export_settings, "use_mesh_cache")
+        col.prop(export_settings, "partition_meshes")
+        col.prop(export_settings, "mesh_threads")
+        col.prop(export_settings, "memory_budget")
+        col.prop(export_settings, "props_batch_size")
+
+        col = layout.column(align=True)
+        col.prop(export_settings, "reuse_scene")
+        sub = col.column(align=True)
+        sub.active = export_settings.reuse_scene
+        sub.prop(export_settings, "rebuild_interval")
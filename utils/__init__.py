@@ -23,8 +23,9 @@ import tomllib
 _needs_reload = "bpy" in locals()
 import bpy
 import mathutils
+import numpy as np
 
-from . import view_layer, errorlog, misc
+from . import view_layer, errorlog, misc, startup_profile
 
 from .misc import get_name_with_lib, pluralize
 
@@ -34,6 +35,7 @@ if _needs_reload:
     view_layer = importlib.reload(view_layer)
     errorlog = importlib.reload(errorlog)
     misc = importlib.reload(misc)
+    startup_profile = importlib.reload(startup_profile)
 
 MESH_OBJECTS = {"MESH", "CURVES", "SURFACE", "META", "FONT"}
 EXPORTABLE_OBJECTS = MESH_OBJECTS | {"LIGHT"}
@@ -72,6 +74,21 @@ def make_key_from_instance(dg_obj_instance):
     return key
 
 
+def get_instance_identity(dg_obj_instance):
+    """
+    Cheaper alternative to make_key_from_instance() for lookups during one export.
+    Only valid as long as the original datablocks exist (uses pointers).
+    """
+    pointer = dg_obj_instance.object.original.as_pointer()
+    if dg_obj_instance.is_instance:
+        return (
+            pointer,
+            dg_obj_instance.parent.original.as_pointer(),
+            tuple(dg_obj_instance.persistent_id),
+        )
+    return (pointer,)
+
+
 def make_name_from_instance(dg_obj_instance):
     return sanitize_luxcore_name(make_key_from_instance(dg_obj_instance))
 
@@ -418,10 +435,11 @@ def absorption_at_depth_scaled(abs_col, depth, scale=1):
 
 
 def all_elems_equal(_list):
-    # https://stackoverflow.com/a/10285205
     # The list must not be empty!
-    first = _list[0]
-    return all(x == first for x in _list)
+    # Works with lists of matrices or numbers, and with numpy arrays
+    # (in that case the elements are compared along the first axis)
+    array = np.asarray(_list)
+    return bool((array == array[0]).all())
 
 
 def use_obj_motion_blur(obj, scene):
@@ -686,6 +704,19 @@ def get_user_dir(name):
 
 VERBOSE_REGISTER = False  # Set to true to see per-class info
 
+# The LuxCore Online Library, the node tree presets and the pyluxcoretools
+# are only used from the UI, so they are neither imported nor registered in
+# background mode (e.g. when rendering on a farm). Scripts that need them in
+# background mode can set the environment variable BLC_LOAD_UI_MODULES=1.
+# Interactive sessions still import and register them at startup.
+LOAD_UI_MODULES = not bpy.app.background or bool(os.environ.get("BLC_LOAD_UI_MODULES"))
+
+
+def _get_profile_name(mod):
+    # Strip the extension repository prefix, e.g. "bl_ext.user_default."
+    return mod.__name__.removeprefix(get_module_name() + ".")
+
+
 def register_module(module_name, classes, submodules=[]):
     """Register a module in Blender.
 
@@ -695,15 +726,17 @@ def register_module(module_name, classes, submodules=[]):
     """
     print(f"[BLC] Registering '{module_name}'")
     for mod in submodules:
-        mod.register()
-
-    for cls in classes:
-        if VERBOSE_REGISTER:
-            print(f"[BLC] Registering {module_name}.{cls.__name__}")
-        try:
-            bpy.utils.register_class(cls)
-        except Exception as err:
-            errorlog.LuxCoreErrorLog.add_warning(err, "\n")
+        with startup_profile.measure("Register", _get_profile_name(mod)):
+            mod.register()
+
+    with startup_profile.measure("Register", f"{module_name} classes"):
+        for cls in classes:
+            if VERBOSE_REGISTER:
+                print(f"[BLC] Registering {module_name}.{cls.__name__}")
+            try:
+                bpy.utils.register_class(cls)
+            except Exception as err:
+                errorlog.LuxCoreErrorLog.add_warning(err, "\n")
 
 
 def unregister_module(module_name, classes, submodules=[]):
@@ -8,24 +8,31 @@ e.g. replace old nodes with updated ones when socket names change.
 """
 
 
+# Node trees converted during this Blender session, by ID.session_uid.
+# Not stored in the node trees, that would mark the .blend file as modified.
+# IDs of a newly loaded file get new session_uids, so they are checked again.
+_converted_session_uids = set()
+
+
 def run():
+    """
+    Returns the number of node trees that had to be checked
+    (node trees that were already converted are skipped)
+    """
+    checked_count = 0
+
     for node_tree in bpy.data.node_groups:
-        if node_tree.bl_idname not in TREE_TYPES:
+        if node_tree.bl_idname not in TREE_TYPES or node_tree.session_uid in _converted_session_uids:
             continue
 
-        update_mat_output_volume_change(node_tree)
-        update_glossy_ior_change(node_tree)
-        update_volume_asymmetry_change(node_tree)
-        update_colormix_remove_min_max_sockets(node_tree)
-        update_imagemap_remove_gamma_brightness_sockets(node_tree)
-        update_cloth_remove_repeat_sockets(node_tree)
-        update_imagemap_add_alpha_output(node_tree)
-        update_smoke_multiple_output_channels(node_tree)
-        update_smoke_mantaflow_simulation(node_tree)
-        update_mat_output_add_shape_input(node_tree)
-        update_glass_disney_add_film_sockets(node_tree)
-        update_invert_add_maximum_input(node_tree)
-        update_brick_texture(node_tree)
+        # One traversal to find out which converters are relevant for this tree
+        bl_idnames = {node.bl_idname for node in node_tree.nodes}
+        for converter, relevant_bl_idnames in NODE_TREE_CONVERTERS:
+            if bl_idnames & relevant_bl_idnames:
+                converter(node_tree)
+
+        _converted_session_uids.add(node_tree.session_uid)
+        checked_count += 1
 
     for scene in bpy.data.scenes:
         config = scene.luxcore.config
@@ -46,6 +53,8 @@ def run():
             camera.dof.aperture_fstop = camera.luxcore.fstop
             camera.luxcore.use_dof = False
 
+    return checked_count
+
 
 def update_mat_output_volume_change(node_tree):
     # commit 3078719a9a33a7e2a798965294463dce6c8b7749
@@ -314,3 +323,22 @@ def update_brick_texture(node_tree):
         node.inputs[node_id].name = "Brick Color 2"
 
         print('Updated %s node "%s" in tree "%s" to new version' % (node.bl_idname, node.name, node_tree.name))
+
+
+# (converter, bl_idnames of the nodes it handles). The converter is only called
+# if the node tree contains at least one of these nodes.
+NODE_TREE_CONVERTERS = (
+    (update_mat_output_volume_change, {"LuxCoreNodeMatOutput"}),
+    (update_glossy_ior_change, {"LuxCoreNodeMatGlossy2", "LuxCoreNodeMatGlossyCoating"}),
+    (update_volume_asymmetry_change, {"LuxCoreNodeVolHeterogeneous", "LuxCoreNodeVolHomogeneous"}),
+    (update_colormix_remove_min_max_sockets, {"LuxCoreNodeTexColorMix"}),
+    (update_imagemap_remove_gamma_brightness_sockets, {"LuxCoreNodeTexImagemap"}),
+    (update_cloth_remove_repeat_sockets, {"LuxCoreNodeMatCloth"}),
+    (update_imagemap_add_alpha_output, {"LuxCoreNodeTexImagemap"}),
+    (update_smoke_multiple_output_channels, {"LuxCoreNodeTexSmoke"}),
+    (update_smoke_mantaflow_simulation, {"LuxCoreNodeTexSmoke"}),
+    (update_mat_output_add_shape_input, {"LuxCoreNodeMatOutput"}),
+    (update_glass_disney_add_film_sockets, {"LuxCoreNodeMatGlass", "LuxCoreNodeMatDisney"}),
+    (update_invert_add_maximum_input, {"LuxCoreNodeTexInvert"}),
+    (update_brick_texture, {"LuxCoreNodeTexBrick"}),
+)
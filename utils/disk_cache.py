@@ -0,0 +1,101 @@
+"""Content-addressed on-disk cache, shared by the exporters.
+
+Does not depend on pyluxcore, see the note in utils/__init__.py
+"""
+
+import os
+import shutil
+import tempfile
+
+
+class DiskCache:
+    """
+    A directory of cache entries, each addressed by a hex digest key.
+    Every entry is a directory, so it can hold several files (e.g. one file
+    per memory-mapped array).
+    The modification time of an entry is updated on every hit, it is used
+    to evict the least recently used entries when the cache grows too large.
+    """
+
+    def __init__(self, root, max_size=0):
+        """
+        :param root: Directory where the entries are stored, created if missing
+        :param max_size: Size limit in bytes, 0 means unlimited
+        """
+        self.root = root
+        self.max_size = max_size
+        os.makedirs(root, exist_ok=True)
+
+    def entry_path(self, key):
+        # Use the first two characters as subdirectory, to avoid
+        # having thousands of entries in one directory
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key):
+        """Return the entry directory if the entry exists, None otherwise"""
+        path = self.entry_path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            # Mark the entry as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def begin_write(self, key):
+        """
+        Return a temporary directory to write the entry files into.
+        Call commit() when done, or abort() in case of errors.
+        """
+        parent = os.path.dirname(self.entry_path(key))
+        os.makedirs(parent, exist_ok=True)
+        return tempfile.mkdtemp(prefix=key + ".", suffix=".tmp", dir=parent)
+
+    def commit(self, key, temp_path):
+        """Atomically move a temporary directory into place"""
+        try:
+            os.rename(temp_path, self.entry_path(key))
+        except OSError:
+            # Another process was faster and stored the same entry
+            self.abort(temp_path)
+            return self.get(key)
+        return self.entry_path(key)
+
+    def abort(self, temp_path):
+        shutil.rmtree(temp_path, ignore_errors=True)
+
+    def evict(self):
+        """Delete the least recently used entries until the size limit is met"""
+        if self.max_size <= 0:
+            return 0
+
+        entries = []
+        total_size = 0
+        for subdir in os.scandir(self.root):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if not entry.is_dir() or entry.name.endswith(".tmp"):
+                    continue
+                size = _get_dir_size(entry.path)
+                entries.append((entry.stat().st_mtime, size, entry.path))
+                total_size += size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+            removed += 1
+        return removed
+
+
+def _get_dir_size(path):
+    size = 0
+    for entry in os.scandir(path):
+        if entry.is_file():
+            size += entry.stat().st_size
+    return size
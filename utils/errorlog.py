@@ -1,6 +1,11 @@
 import bpy
 from . import ui as utils_ui
 
+# Limits of the stored details, so scenes with many warnings (e.g. thousands of
+# objects without UVs) don't fill the memory and the UI
+MAX_MESSAGES = 1000
+MAX_OBJECTS_PER_MESSAGE = 100
+
 
 def update_ui():
     try:
@@ -13,10 +18,34 @@ def update_ui():
 
 
 class LuxCoreError:
-    def __init__(self, message, obj_name):
-        self.message = str(message)
-        self.count = 1
-        self.obj_name = obj_name
+    """
+    A message and the objects it was reported for.
+    The same message reported for many objects is only stored once.
+    """
+    def __init__(self, message):
+        self.message = message
+        self.count = 0
+        # {obj_name: count}, at most MAX_OBJECTS_PER_MESSAGE entries
+        self.objects = {}
+        # Number of reports for objects that were not stored because of the limit
+        self.omitted_count = 0
+
+    @property
+    def obj_name(self):
+        """The first object this message was reported for"""
+        return next(iter(self.objects), "")
+
+    def add(self, obj_name):
+        """Returns True if this message was not reported for the object before"""
+        self.count += 1
+        if obj_name in self.objects:
+            self.objects[obj_name] += 1
+            return False
+        if len(self.objects) >= MAX_OBJECTS_PER_MESSAGE:
+            self.omitted_count += 1
+            return False
+        self.objects[obj_name] = 1
+        return True
 
 
 class LuxCoreErrorLog:
@@ -27,33 +56,68 @@ class LuxCoreErrorLog:
     report: missing textures, IES files, materials, node trees etc.
     But not every small export warning that can happen in normal Blender scenes,
     do not report: object without mesh data (aka Empty) or mesh without faces (e.g. curves used in modifiers)
+
+    Adding a warning does not redraw the UI, call refresh_ui() at the end of an export phase.
     """
     errors = []
     warnings = []
+    # {message: LuxCoreError}, to find already reported messages without a linear search
+    _error_index = {}
+    _warning_index = {}
+    # Number of reports that were not stored because of MAX_MESSAGES
+    dropped_count = 0
+    _needs_ui_update = False
 
     @classmethod
     def add_error(cls, message, obj_name=""):
-        cls._add("ERROR:", cls.errors, message, obj_name)
+        cls._add("ERROR:", cls.errors, cls._error_index, message, obj_name)
+        # Errors abort the render, show them immediately
+        cls.refresh_ui()
 
     @classmethod
     def add_warning(cls, message, obj_name=""):
-        cls._add("WARNING:", cls.warnings, message, obj_name)
+        cls._add("WARNING:", cls.warnings, cls._warning_index, message, obj_name)
 
     @classmethod
     def clear(cls, force_ui_update=True):
+        had_entries = bool(cls.errors or cls.warnings)
         cls.errors.clear()
         cls.warnings.clear()
-        update_ui()
+        cls._error_index.clear()
+        cls._warning_index.clear()
+        cls.dropped_count = 0
+
+        if force_ui_update:
+            cls._needs_ui_update = False
+            update_ui()
+        elif had_entries:
+            cls._needs_ui_update = True
 
     @classmethod
-    def _add(cls, prefix, collection, message, obj_name):
-        for elem in collection:
-            if elem.message == message and elem.obj_name == obj_name:
-                elem.count += 1
-                # print("Error or warning already logged. Abort adding to collection.")
+    def refresh_ui(cls):
+        """Redraw the error log panel if something changed since the last call"""
+        if cls._needs_ui_update:
+            cls._needs_ui_update = False
+            update_ui()
+
+    @classmethod
+    def _add(cls, prefix, collection, index, message, obj_name):
+        message = str(message)
+        elem = index.get(message)
+
+        if elem is None:
+            if len(collection) >= MAX_MESSAGES:
+                cls.dropped_count += 1
                 return
+            elem = LuxCoreError(message)
+            index[message] = elem
+            collection.append(elem)
 
-        print(prefix, message)
-        new = LuxCoreError(message, obj_name)
-        collection.append(new)
-        update_ui()
+        cls._needs_ui_update = True
+        if elem.add(obj_name):
+            if obj_name and len(elem.objects) > 1:
+                print(prefix, message, f'(Object: "{obj_name}")')
+            else:
+                print(prefix, message)
+            if len(elem.objects) == MAX_OBJECTS_PER_MESSAGE:
+                print(prefix, "Further objects with this message are not listed")
@@ -0,0 +1,100 @@
+"""Memory usage of the Blender process, used for the export statistics.
+
+Does not depend on pyluxcore, see the note in utils/__init__.py
+"""
+
+from contextlib import contextmanager
+import os
+import sys
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    def _get_counters():
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return counters
+
+    def get_resident():
+        """Current resident memory (working set) of the process in bytes"""
+        return _get_counters().WorkingSetSize
+
+    def get_peak():
+        """Highest resident memory of the process since it was started, in bytes"""
+        return _get_counters().PeakWorkingSetSize
+else:
+    import resource
+
+    # ru_maxrss is in bytes on macOS, in kilobytes on Linux
+    _PEAK_UNIT = 1 if sys.platform == "darwin" else 1024
+
+    try:
+        # Kept open, re-reading an open procfs file is much cheaper than opening it again
+        _statm = os.open("/proc/self/statm", os.O_RDONLY)
+        _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        _statm = None
+
+    def get_peak():
+        """Highest resident memory of the process since it was started, in bytes"""
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _PEAK_UNIT
+
+    def get_resident():
+        """Current resident memory of the process in bytes"""
+        if _statm is None:
+            # There is no cheap way to get the current usage (e.g. on macOS)
+            return get_peak()
+        return int(os.pread(_statm, 64, 0).split()[1]) * _PAGE_SIZE
+
+
+class MemoryPhases:
+    """
+    Resident memory growth and peak of named export phases (e.g. "meshes").
+    A phase can be measured several times, e.g. once per converted mesh.
+    The growth is summed up, the peak is the highest usage above the resident
+    memory at the start of a measurement. Temporary allocations are only
+    noticed if they raise the peak of the whole process.
+    """
+
+    def __init__(self):
+        self.resident = {}
+        self.peak = {}
+
+    def clear(self):
+        self.resident.clear()
+        self.peak.clear()
+
+    @contextmanager
+    def measure(self, phase):
+        resident_before = get_resident()
+        peak_before = get_peak()
+        try:
+            yield
+        finally:
+            resident_after = get_resident()
+            peak_after = get_peak()
+            highest = peak_after if peak_after > peak_before else resident_after
+            self.resident[phase] = self.resident.get(phase, 0) + resident_after - resident_before
+            self.peak[phase] = max(self.peak.get(phase, 0), highest - resident_before)
+
+    def get(self, phase):
+        """Returns a (resident growth, peak) tuple in bytes"""
+        return self.resident.get(phase, 0), self.peak.get(phase, 0)
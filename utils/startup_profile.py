@@ -0,0 +1,47 @@
+"""Import and registration times of the addon submodules.
+
+Enabled by setting the environment variable BLC_PROFILE_STARTUP=1 before
+starting Blender, the times are printed when the addon is registered.
+
+Does not depend on pyluxcore, see the note in utils/__init__.py
+"""
+
+from contextlib import contextmanager
+import os
+from time import perf_counter
+
+ENABLED = bool(os.environ.get("BLC_PROFILE_STARTUP"))
+
+# List of (step, name, seconds) tuples in the order the steps finished
+_timings = []
+
+
+def add(step, name, duration):
+    if ENABLED:
+        _timings.append((step, name, duration))
+
+
+@contextmanager
+def measure(step, name):
+    if not ENABLED:
+        yield
+        return
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        _timings.append((step, name, perf_counter() - start))
+
+
+def report():
+    """Print the collected times, slowest first, and start over"""
+    if not ENABLED or not _timings:
+        return
+
+    # Nested steps (e.g. the submodules registered by "operators") are
+    # contained in the time of their parent, so they are not summed up
+    print("[BLC] Startup profile (nested steps are included in their parents):")
+    for step, name, duration in sorted(_timings, key=lambda timing: timing[2], reverse=True):
+        print(f"[BLC]   {step:<9} {name:<32} {duration * 1000:9.2f} ms")
+    _timings.clear()
@@ -56,6 +56,13 @@ def samples_per_sec_to_string(samples_per_sec):
         return "%d k" % (samples_per_sec / 10**3)
 
 
+def instances_per_sec_to_string(instances_per_sec):
+    if instances_per_sec >= 10**6:
+        return "%.1f M/s" % (instances_per_sec / 10**6)
+    else:
+        return "%.1f k/s" % (instances_per_sec / 10**3)
+
+
 def triangle_count_to_string(triangle_count):
     if triangle_count >= 10**6:
         return "%.1f M" % (triangle_count / 10**6)
@@ -160,6 +167,17 @@ def vram_better(first_usage_tuple, second_usage_tuple):
     return first_used_memory < second_used_memory
 
 
+def memory_usage_to_string(usage_tuple):
+    resident, peak = usage_tuple
+    return "%d MiB (peak %d MiB)" % (resident / (1024 * 1024), peak / (1024 * 1024))
+
+
+def memory_better(first_usage_tuple, second_usage_tuple):
+    first_resident, _ = first_usage_tuple
+    second_resident, _ = second_usage_tuple
+    return first_resident < second_resident
+
+
 def bool_to_string(value):
     if value:
         return "Enabled"